@@ -40,11 +40,12 @@ async def _scan(limit: int, threshold: float) -> None:
     try:
         opportunities = await scan_once(pm_client, op_client, limit=limit, threshold=threshold)
         print_opportunities(opportunities)
+        ts = timestamp()
         log_opportunities(
             [
                 {
-                    "ts": timestamp(),
-                    "route": opp.route,
+                    "ts": ts,
+                    "route": opp.route.label,
                     "pm_id": opp.pair.polymarket.market_id,
                     "op_id": opp.pair.opinion.market_id,
                     "size": opp.size,
@@ -103,10 +104,11 @@ async def _scan_hedge(
             vol_max_candles=settings.hedge_vol_max_candles,
         )
         print_hedge_opportunities(opportunities)
+        ts = timestamp()
         log_opportunities(
             [
                 {
-                    "ts": timestamp(),
+                    "ts": ts,
                     "market_id": opp.market.market_id,
                     "title": opp.market.title,
                     "underlying": opp.underlying_symbol,
@@ -384,7 +386,7 @@ def run_bot(interval: int, threshold: float, use_ws: bool) -> None:
                             "green" if opp.profit_percent >= 2.0 else ("yellow" if opp.profit_percent >= 1.0 else "red")
                         )
                         table.add_row(
-                            opp.route,
+                            opp.route.label,
                             opp.pair.polymarket.market_id,
                             opp.pair.opinion.market_id,
                             f"{opp.size or 0:.2f}",
@@ -126,7 +126,7 @@ def print_opportunities(opportunities: list[ArbOpportunity]) -> None:
     for opp in opportunities:
         profit_style = "green" if opp.profit_percent >= 2.0 else ("yellow" if opp.profit_percent >= 1.0 else "red")
         table.add_row(
-            opp.route,
+            opp.route.label,
             opp.pair.polymarket.market_id,
             opp.pair.opinion.market_id,
             f"{opp.size or 0:.2f}",
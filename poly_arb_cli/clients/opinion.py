@@ -149,8 +149,10 @@ class OpinionClient:
             # 完全未配置 Opinion，返回中性价格避免干扰套利逻辑。
             return PriceQuote(yes_price=1.0, no_price=1.0, yes_liquidity=0.0, no_liquidity=0.0)
 
-        yes_book = await self.get_orderbook(market, side="yes")
-        no_book = await self.get_orderbook(market, side="no")
+        yes_book, no_book = await asyncio.gather(
+            self.get_orderbook(market, side="yes"),
+            self.get_orderbook(market, side="no"),
+        )
         yes_price = _best_price(yes_book, side="buy")
         no_price = _best_price(no_book, side="buy")
         return PriceQuote(
@@ -199,9 +201,9 @@ class OpinionClient:
             bids_raw = _get(raw, "bids") or []
             asks_raw = _get(raw, "asks") or []
 
-        bids = [_to_level(entry) for entry in bids_raw if _to_level(entry) is not None]
-        asks = [_to_level(entry) for entry in asks_raw if _to_level(entry) is not None]
-        return OrderBook(bids=bids, asks=asks)
+        bids = [level for level in map(_to_level, bids_raw) if level is not None]
+        asks = [level for level in map(_to_level, asks_raw) if level is not None]
+        return OrderBook.from_unsorted(bids, asks)
 
     async def place_order(self, market: Market, side: str, price: float, size: float) -> str:
         """通过 Opinion CLOB SDK 提交订单。
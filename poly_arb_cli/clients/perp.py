@@ -16,7 +16,8 @@ class PerpClient:
     """封装 ccxt 交易所实例，支持在扫描阶段获取标的价格与资金费率。
 
     初始化不强制要求 API Key；若缺失 ccxt 依赖，会在首次调用时抛出
-    友好的错误提示，避免 CLI 无响应。
+    友好的错误提示，避免 CLI 无响应。ccxt 交易所实例在构造时创建一次，
+    其内部 HTTP 会话在所有请求间复用；支持 ``async with`` 自动关闭。
     """
 
     def __init__(self, settings: Settings, exchange_id: Optional[str] = None):
@@ -92,6 +93,14 @@ class PerpClient:
             except Exception:
                 pass
 
+    async def __aenter__(self) -> "PerpClient":
+        """进入异步上下文，返回客户端自身。"""
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        """退出异步上下文时关闭底层连接。"""
+        await self.close()
+
     async def fetch_realized_vol(
         self,
         symbol: str,
@@ -4,26 +4,48 @@ from __future__ import annotations
 
 import asyncio
 import json
-from typing import Iterable, List, Optional
+from datetime import datetime, timezone
+from typing import AsyncIterator, Iterable, List, Optional
 
 import httpx
 
 from ..config import Settings
 from ..types import Market, OrderBook, OrderBookLevel, Platform, Position, PriceQuote, Tag, TradeEvent
 
+# Gamma/Data 连接池：保留 httpx 默认的 100 条连接上限，只放宽可复用的 keep-alive 连接数
+# （默认 20），同一客户端实例的并发请求无需反复建立 TCP/TLS 连接。
+_HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=64)
+
+# HTTP/2 依赖可选的 h2 包（``pip install httpx[http2]``）；已安装时启用多路复用，
+# 并发请求可共享少量连接，否则退回 HTTP/1.1 keep-alive。
+try:
+    import h2  # type: ignore  # noqa: F401
+except ImportError:
+    _HTTP2 = False
+else:
+    _HTTP2 = True
+
 
 class PolymarketClient:
     """Polymarket 数据客户端。
 
     使用 Gamma API 获取市场元数据，使用 CLOB 客户端查询盘口与价格。
     目前仅实现读取能力，交易相关接口会抛出异常。
+
+    底层 HTTP 客户端在构造时创建一次并在所有请求间复用（安装 h2 时启用
+    HTTP/2）；可通过 ``async with PolymarketClient(settings) as client:``
+    在退出时自动关闭。
     """
 
     def __init__(self, settings: Settings, base_url: Optional[str] = None):
         self.settings = settings
         self.base_url = base_url or settings.polymarket_base_url
-        self._http = httpx.AsyncClient(base_url=self.base_url, timeout=10.0)
-        self._data_http = httpx.AsyncClient(base_url=settings.polymarket_data_url, timeout=10.0)
+        self._http = httpx.AsyncClient(
+            base_url=self.base_url, timeout=10.0, limits=_HTTP_LIMITS, http2=_HTTP2
+        )
+        self._data_http = httpx.AsyncClient(
+            base_url=settings.polymarket_data_url, timeout=10.0, limits=_HTTP_LIMITS, http2=_HTTP2
+        )
 
         self._clob_client = None
         self._clob_import_error: Optional[Exception] = None
@@ -66,6 +88,33 @@ class PolymarketClient:
         Returns:
             按 Gamma API 返回顺序排好的 `Market` 列表。
         """
+        return await self._fetch_market_page(limit=limit, offset=0, tag_id=tag_id)
+
+    async def iter_market_pages(
+        self, limit: int = 500, *, page_size: int = 100, tag_id: Optional[str] = None
+    ) -> AsyncIterator[List[Market]]:
+        """按 Gamma 分页逐页产出可交易市场，便于调用方边拉取边处理。
+
+        Args:
+            limit: 总计最多产出的市场数量。
+            page_size: 单次请求的分页大小。
+            tag_id: 可选 tag ID，仅返回该标签下的市场。
+
+        Yields:
+            每页解析后的 `Market` 列表；某页不足 ``page_size`` 条即视为最后一页。
+        """
+        offset = 0
+        while offset < limit:
+            size = min(page_size, limit - offset)
+            page = await self._fetch_market_page(limit=size, offset=offset, tag_id=tag_id)
+            if page:
+                yield page
+            if len(page) < size:
+                return
+            offset += size
+
+    async def _fetch_market_page(self, *, limit: int, offset: int, tag_id: Optional[str]) -> List[Market]:
+        """请求 Gamma ``/markets`` 的一页并解析为 `Market` 列表。"""
         params = {
             "active": True,
             "closed": False,
@@ -73,76 +122,15 @@ class PolymarketClient:
             "limit": limit,
             "enableOrderBook": True,
         }
+        if offset:
+            params["offset"] = offset
         if tag_id:
             params["tag_id"] = tag_id
         resp = await self._http.get("/markets", params=params)
         resp.raise_for_status()
         payload = resp.json()
         markets_raw = payload if isinstance(payload, list) else []
-
-        results: List[Market] = []
-        for mk in markets_raw[:limit]:
-            condition_id = mk.get("conditionId")
-            market_id = mk.get("id") or condition_id or mk.get("marketHash") or mk.get("_id")
-            title = mk.get("question") or mk.get("title") or mk.get("name") or str(market_id)
-            # 分类与标签字段：Gamma 通常提供 `category` 与 `tags`。
-            raw_category = mk.get("category")
-            raw_tags = mk.get("tags") or []
-            tags: list[str] = []
-            if isinstance(raw_tags, list):
-                tags = [str(t) for t in raw_tags if t is not None]
-            # 若未显式提供 category，则使用首个 tag 作为粗粒度分类。
-            category = str(raw_category) if raw_category else (tags[0] if tags else None)
-            # 成交量与流动性字段（采用 24 小时 CLOB 成交量与当前 CLOB 流动性）
-            volume_24h = (
-                mk.get("volume24hrClob")
-                or mk.get("volume24hr")
-                or mk.get("volume24hrclob")
-                or mk.get("volume24HrClob")
-            )
-            liquidity = mk.get("liquidityClob") or mk.get("liquidityNum") or mk.get("liquidity")
-            try:
-                vol_val = float(volume_24h) if volume_24h is not None else None
-            except Exception:
-                vol_val = None
-            try:
-                liq_val = float(liquidity) if liquidity is not None else None
-            except Exception:
-                liq_val = None
-            # 事件结束/结算时间：不同版本 Gamma 可能使用 endDate / end_time / closeDate 等字段。
-            end_date = _parse_market_end_date(mk)
-            # clobTokenIds is a stringified list in Gamma; parse if present.
-            yes_token = None
-            no_token = None
-            clob_token_ids = mk.get("clobTokenIds")
-            token_ids: Optional[List[str]] = None
-            if isinstance(clob_token_ids, str):
-                try:
-                    token_ids = json.loads(clob_token_ids)
-                except Exception:
-                    token_ids = None
-            elif isinstance(clob_token_ids, list):
-                token_ids = clob_token_ids
-            if token_ids and len(token_ids) >= 2:
-                yes_token = str(token_ids[0])
-                no_token = str(token_ids[1])
-
-            results.append(
-                Market(
-                    platform=Platform.POLYMARKET,
-                    market_id=str(market_id),
-                    title=str(title),
-                    condition_id=str(condition_id) if condition_id else None,
-                    end_date=end_date,
-                    category=category,
-                    volume=vol_val,
-                    liquidity=liq_val,
-                    yes_token_id=str(yes_token) if yes_token else None,
-                    no_token_id=str(no_token) if no_token else None,
-                    tags=tags or None,
-                )
-            )
-        return results
+        return [_parse_gamma_market(mk) for mk in markets_raw[:limit]]
 
     async def get_best_prices(self, market: Market) -> PriceQuote:
         """基于 CLOB 盘口计算给定市场 YES/NO 最优价格。
@@ -153,8 +141,10 @@ class PolymarketClient:
         Returns:
             汇总 YES/NO 最优买价与近端流动性的 `PriceQuote`。
         """
-        yes_book = await self.get_orderbook(market, side="yes")
-        no_book = await self.get_orderbook(market, side="no")
+        yes_book, no_book = await asyncio.gather(
+            self.get_orderbook(market, side="yes"),
+            self.get_orderbook(market, side="no"),
+        )
         yes_price = _best_price(yes_book, side="buy")
         no_price = _best_price(no_book, side="buy")
         return PriceQuote(
@@ -185,9 +175,9 @@ class PolymarketClient:
 
         bids_raw = getattr(ob_summary, "bids", None) or []
         asks_raw = getattr(ob_summary, "asks", None) or []
-        bids = [_to_level(entry) for entry in bids_raw if _to_level(entry) is not None]
-        asks = [_to_level(entry) for entry in asks_raw if _to_level(entry) is not None]
-        return OrderBook(bids=bids, asks=asks)
+        bids = [level for level in map(_to_level, bids_raw) if level is not None]
+        asks = [level for level in map(_to_level, asks_raw) if level is not None]
+        return OrderBook.from_unsorted(bids, asks)
 
     async def _fallback_orders(self, market: Market) -> tuple[list, list]:
         """备用方案：直接从 Gamma 订单接口读取盘口（部分老接口兼容）。
@@ -238,6 +228,14 @@ class PolymarketClient:
         await self._http.aclose()
         await self._data_http.aclose()
 
+    async def __aenter__(self) -> "PolymarketClient":
+        """进入异步上下文，返回客户端自身。"""
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        """退出异步上下文时关闭底层连接。"""
+        await self.close()
+
     async def get_recent_trades(self, *, limit: int = 200) -> List[TradeEvent]:
         """从 Data-API 获取最近成交列表。
 
@@ -361,6 +359,71 @@ class PolymarketClient:
             return None
 
 
+def _parse_gamma_market(mk: dict) -> Market:
+    """将 Gamma ``/markets`` 返回的单条记录解析为 `Market`。"""
+    condition_id = mk.get("conditionId")
+    market_id = mk.get("id") or condition_id or mk.get("marketHash") or mk.get("_id")
+    title = mk.get("question") or mk.get("title") or mk.get("name") or str(market_id)
+    # 分类与标签字段：Gamma 通常提供 `category` 与 `tags`。
+    raw_category = mk.get("category")
+    raw_tags = mk.get("tags") or []
+    tags: list[str] = []
+    if isinstance(raw_tags, list):
+        tags = [str(t) for t in raw_tags if t is not None]
+    # 若未显式提供 category，则使用首个 tag 作为粗粒度分类。
+    category = str(raw_category) if raw_category else (tags[0] if tags else None)
+    # 成交量与流动性字段（采用 24 小时 CLOB 成交量与当前 CLOB 流动性）
+    volume_24h = (
+        mk.get("volume24hrClob")
+        or mk.get("volume24hr")
+        or mk.get("volume24hrclob")
+        or mk.get("volume24HrClob")
+    )
+    liquidity = mk.get("liquidityClob") or mk.get("liquidityNum") or mk.get("liquidity")
+    try:
+        vol_val = float(volume_24h) if volume_24h is not None else None
+    except Exception:
+        vol_val = None
+    try:
+        liq_val = float(liquidity) if liquidity is not None else None
+    except Exception:
+        liq_val = None
+    # 事件结束/结算时间：不同版本 Gamma 可能使用 endDate / end_time / closeDate 等字段。
+    # 解析结果同时保留为 datetime，供扫描器直接使用而无需再次解析字符串。
+    end_dt = _parse_market_end_dt(mk)
+    end_date = end_dt.isoformat() if end_dt is not None else None
+    # clobTokenIds is a stringified list in Gamma; parse if present.
+    yes_token = None
+    no_token = None
+    clob_token_ids = mk.get("clobTokenIds")
+    token_ids: Optional[List[str]] = None
+    if isinstance(clob_token_ids, str):
+        try:
+            token_ids = json.loads(clob_token_ids)
+        except Exception:
+            token_ids = None
+    elif isinstance(clob_token_ids, list):
+        token_ids = clob_token_ids
+    if token_ids and len(token_ids) >= 2:
+        yes_token = str(token_ids[0])
+        no_token = str(token_ids[1])
+
+    return Market(
+        platform=Platform.POLYMARKET,
+        market_id=str(market_id),
+        title=str(title),
+        condition_id=str(condition_id) if condition_id else None,
+        end_date=end_date,
+        end_dt_utc=end_dt,
+        category=category,
+        volume=vol_val,
+        liquidity=liq_val,
+        yes_token_id=str(yes_token) if yes_token else None,
+        no_token_id=str(no_token) if no_token else None,
+        tags=tags or None,
+    )
+
+
 def _lookup(entries: Iterable[dict[str, object]], market_id: str) -> dict[str, object]:
     """在原始列表中按 market_id 查找元素。
 
@@ -439,21 +502,19 @@ def _best_price(orderbook: OrderBook, side: str) -> float:
     return float(level.price) if level else 1.0
 
 
-def _parse_market_end_date(data: dict) -> Optional[str]:
-    """从 Gamma 市场字典中提取结束时间并标准化为 ISO8601 字符串。
+def _parse_market_end_dt(data: dict) -> Optional[datetime]:
+    """从 Gamma 市场字典中提取结束时间并解析为 UTC datetime。
 
     Gamma 在不同版本中可能使用 ``endDate``、``end_time``、``closeDate``、
     ``resolveTime`` 等字段来表示市场结束或结算时间。本函数会按常见字段
-    顺序尝试读取，并将 Unix 时间戳或可解析的字符串统一转换为 ISO8601。
+    顺序尝试读取，并将 Unix 时间戳或可解析的字符串统一转换为 UTC datetime。
 
     Args:
         data: 单个 Gamma 市场的原始字典。
 
     Returns:
-        ISO8601 格式的 UTC 时间字符串；若无法解析则返回 ``None``。
+        UTC 时区的 datetime；若无法解析则返回 ``None``。
     """
-    from datetime import datetime, timezone
-
     candidates = [
         "endDate",
         "end_date",
@@ -479,20 +540,19 @@ def _parse_market_end_date(data: dict) -> Optional[str]:
             # 认为大于 10^11 的为毫秒级时间戳
             if ts > 1e11:
                 ts /= 1000.0
-            dt = datetime.fromtimestamp(ts, tz=timezone.utc)
-            return dt.isoformat()
+            return datetime.fromtimestamp(ts, tz=timezone.utc)
     except Exception:
         pass
 
     # 字符串：尝试直接解析或补充时区信息
     if isinstance(raw, str):
         txt = raw.strip()
-        # 若已经是 ISO8601，优先直接返回
+        # 若已经是 ISO8601，优先直接解析
         try:
             dt = datetime.fromisoformat(txt.replace("Z", "+00:00"))
             if dt.tzinfo is None:
                 dt = dt.replace(tzinfo=timezone.utc)
-            return dt.astimezone(timezone.utc).isoformat()
+            return dt.astimezone(timezone.utc)
         except Exception:
             pass
         # 作为备选方案，再尝试解析为整数时间戳
@@ -500,8 +560,7 @@ def _parse_market_end_date(data: dict) -> Optional[str]:
             ts = float(txt)
             if ts > 1e11:
                 ts /= 1000.0
-            dt = datetime.fromtimestamp(ts, tz=timezone.utc)
-            return dt.isoformat()
+            return datetime.fromtimestamp(ts, tz=timezone.utc)
         except Exception:
             return None
 
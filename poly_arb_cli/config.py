@@ -65,6 +65,8 @@ class Settings(BaseSettings):
     tail_min_annualized_yield_percent: float = 20.0
     tail_max_sweep_size: float = 50.0
     tail_fee_rate: float = 0.02  # 预估结算费用占比
+    tail_rest_concurrency: int = 16  # WS 未覆盖时并发 REST 盘口请求上限
+    tail_top_k: Optional[int] = 50  # 仅保留收益最高的前 K 个机会，None 表示全部
 
     scan_interval_seconds: int = 60
     max_trade_size: float = 50.0
@@ -13,6 +13,7 @@ import asyncio
 import json
 from collections import defaultdict, deque
 from dataclasses import dataclass, field
+from itertools import islice
 from typing import Deque, Dict, Iterable, List, Optional
 
 import websockets
@@ -27,8 +28,10 @@ class PolymarketStreamState:
 
     Attributes:
         orderbooks: 以 token_id 为键的最新订单簿快照。
-        trades_by_condition: 每个 condition_id 最近的成交事件环形缓冲。
-        max_trades_per_market: 单市场最多保留的成交数。
+        trades_by_condition: 每个 condition_id 最近的成交事件环形缓冲，
+            ``deque(maxlen=max_trades_per_market)``，长时间运行内存也有上界。
+        max_trades_per_market: 单市场最多保留的成交数（环形缓冲的 maxlen）。
+        version: 单调递增的更新计数，每次 book/price_change/成交写入后加一。
     """
 
     orderbooks: Dict[str, OrderBook] = field(default_factory=dict)
@@ -36,22 +39,74 @@ class PolymarketStreamState:
         default_factory=lambda: defaultdict(lambda: deque(maxlen=200))
     )
     max_trades_per_market: int = 200
+    version: int = 0
+    _changed: asyncio.Event = field(default_factory=asyncio.Event, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # 新建的缓冲直接使用配置的容量，避免先按默认 200 建好再在写入时重建。
+        if isinstance(self.trades_by_condition, defaultdict):
+            self.trades_by_condition.default_factory = lambda: deque(maxlen=self.max_trades_per_market)
+
+    def _mark_changed(self) -> None:
+        """递增版本号并唤醒等待更新的消费者。"""
+        self.version += 1
+        self._changed.set()
+
+    async def wait_for_update(self, since: int, timeout: Optional[float] = None) -> bool:
+        """等待 state 版本号超过 ``since``，供消费者按行情增量驱动刷新。
+
+        两次等待之间到达的多条增量会合并为一次唤醒。
+
+        Args:
+            since: 调用方上次处理时读取的 ``version``。
+            timeout: 最长等待秒数；``None`` 表示一直等待。
+
+        Returns:
+            期间有新增量返回 ``True``，超时返回 ``False``。
+        """
+        while self.version == since:
+            self._changed.clear()
+            try:
+                await asyncio.wait_for(self._changed.wait(), timeout)
+            except asyncio.TimeoutError:
+                return False
+        return True
 
     def apply_book_snapshot(self, asset_id: str, bids: Iterable[dict], asks: Iterable[dict]) -> None:
         """根据 MARKET channel 的 book 消息更新指定资产的订单簿。"""
-        bid_levels: List[OrderBookLevel] = []
-        ask_levels: List[OrderBookLevel] = []
-        for entry in bids:
-            level = _to_level(entry)
-            if level is not None:
-                bid_levels.append(level)
-        for entry in asks:
-            level = _to_level(entry)
-            if level is not None:
-                ask_levels.append(level)
-
-        # WS 消息已经按照从优到劣的顺序给出，不再排序。
-        self.orderbooks[asset_id] = OrderBook(bids=bid_levels, asks=ask_levels)
+        bid_levels: List[OrderBookLevel] = [level for level in map(_to_level, bids) if level is not None]
+        ask_levels: List[OrderBookLevel] = [level for level in map(_to_level, asks) if level is not None]
+
+        self.orderbooks[asset_id] = OrderBook.from_unsorted(bid_levels, ask_levels)
+        self._mark_changed()
+
+    def apply_price_change(self, data: dict) -> None:
+        """根据 price_change 消息就地更新订单簿中的单个价位。
+
+        订单簿重建遵循「快照 + 按序回放增量」：在已有快照上二分定位价位，
+        数量为 0 时删除该档，否则原地改写数量或插入新档，不重建整个列表。
+        兼容顶层 ``asset_id`` + ``changes`` 与逐条带 ``asset_id`` 的
+        ``price_changes`` 两种消息格式；尚无快照的资产直接忽略。
+        """
+        default_asset = str(data.get("asset_id") or "")
+        changed = False
+        for change in data.get("price_changes") or data.get("changes") or []:
+            if not isinstance(change, dict):
+                continue
+            try:
+                asset_id = str(change.get("asset_id") or default_asset)
+                price = float(change["price"])
+                size = float(change["size"])
+                side = str(change.get("side") or "")
+            except Exception:
+                continue
+            book = self.orderbooks.get(asset_id)
+            if book is None:
+                continue
+            if book.apply_delta(side, price, size):
+                changed = True
+        if changed:
+            self._mark_changed()
 
     def append_last_trade(self, data: dict) -> None:
         """根据 last_trade_price 消息追加一条成交记录。"""
@@ -84,6 +139,7 @@ class PolymarketStreamState:
             buf = deque(buf, maxlen=self.max_trades_per_market)
             self.trades_by_condition[condition_id] = buf
         buf.append(trade)
+        self._mark_changed()
 
     def get_orderbook_for_market(self, market: Market, side: str = "yes") -> Optional[OrderBook]:
         """根据 Market 对象与 YES/NO 返回对应 token 的订单簿。"""
@@ -92,12 +148,56 @@ class PolymarketStreamState:
             return None
         return self.orderbooks.get(token_id)
 
+    def bulk_ask_snapshot(self, token_ids: Iterable[str]) -> Dict[str, OrderBook]:
+        """批量取出给定 token 中卖盘非空的订单簿。
+
+        供扫描器在循环前一次性预取 WS 覆盖的盘口，循环内只需一次字典查找。
+
+        Args:
+            token_ids: 待查询的 token_id 序列。
+
+        Returns:
+            ``{token_id: OrderBook}``，仅包含本地已有且卖盘非空的条目。
+        """
+        books = self.orderbooks
+        return {tid: ob for tid in token_ids if (ob := books.get(tid)) is not None and ob.asks}
+
     def get_last_trades(self, condition_id: str, limit: int = 50) -> List[TradeEvent]:
         """获取某个 condition 最近的成交列表。"""
         buf = self.trades_by_condition.get(condition_id)
         if not buf:
             return []
-        return list(buf)[-limit:]
+        if len(buf) <= limit:
+            return list(buf)
+        # 只从尾部取 limit 条，不复制整个环形缓冲。
+        recent = list(islice(reversed(buf), limit))
+        recent.reverse()
+        return recent
+
+    def get_last_trade(
+        self, condition_id: str, min_timestamp: Optional[int] = None
+    ) -> tuple[int, Optional[TradeEvent]]:
+        """获取某个 condition 的成交条数与最近一笔成交，不复制也不修改缓冲区。
+
+        Args:
+            condition_id: 市场条件 ID。
+            min_timestamp: 可选的时间下界（秒）；给定时只统计不早于该时间的成交。
+                成交按到达顺序追加，从尾部向前计数，遇到第一条更早的成交即停止。
+
+        Returns:
+            ``(成交条数, 最近一笔成交)``；无成交时为 ``(0, None)``。
+        """
+        buf = self.trades_by_condition.get(condition_id)
+        if not buf:
+            return 0, None
+        if min_timestamp is None:
+            return len(buf), buf[-1]
+        count = 0
+        for trade in reversed(buf):
+            if int(trade.timestamp or 0) < min_timestamp:
+                break
+            count += 1
+        return count, buf[-1]
 
 
 class MarketWsFeed:
@@ -159,7 +259,12 @@ class MarketWsFeed:
                                 self.state.append_last_trade(data)
                                 continue
 
-                            # 其他 event_type（price_change / tick_size_change）当前忽略
+                            # 价位增量：在本地快照上就地回放
+                            if event_type == "price_change":
+                                self.state.apply_price_change(data)
+                                continue
+
+                            # 其他 event_type（tick_size_change）当前忽略
             except Exception:
                 # 简单指数退避重连
                 await asyncio.sleep(backoff)
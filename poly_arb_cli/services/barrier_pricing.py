@@ -9,6 +9,12 @@ from __future__ import annotations
 import math
 from typing import Optional
 
+# 1/sqrt(2)，预先计算以乘法代替每次调用的开方与除法。
+_INV_SQRT2 = 1.0 / math.sqrt(2.0)
+
+# 深度虚值阈值：z 超过该值时触及概率 erfc(z / sqrt(2)) < 1.3e-15，直接视为 0。
+_DEEP_OTM_Z = 8.0
+
 
 def one_touch_prob(
     spot: float,
@@ -49,8 +55,11 @@ def one_touch_prob(
         return 1.0
 
     z = (gap - drift_term) / (sigma * sqrt_t)
-    # 反射原理的简化版，忽略高阶项
-    prob = 2 * (1 - norm_cdf(z))
+    if z > _DEEP_OTM_Z:
+        return 0.0
+    # 反射原理的简化版，忽略高阶项：2 * (1 - N(z)) = erfc(z / sqrt(2))。
+    # 直接用 erfc 计算尾部概率，避免 z 较大时 1 - N(z) 的相减抵消误差。
+    prob = math.erfc(z * _INV_SQRT2)
     return max(0.0, min(1.0, prob))
 
 
@@ -69,4 +78,4 @@ def no_touch_prob(
 
 def norm_cdf(x: float) -> float:
     """正态分布累积函数。"""
-    return 0.5 * (1.0 + math.erf(x / math.sqrt(2.0)))
+    return 0.5 * (1.0 + math.erf(x * _INV_SQRT2))
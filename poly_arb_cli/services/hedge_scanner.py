@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 import math
 from datetime import datetime, timezone
@@ -10,7 +11,7 @@ from typing import Iterable, List, Optional
 
 from ..clients.perp import PerpClient
 from ..clients.polymarket import PolymarketClient
-from ..services.barrier_pricing import no_touch_prob, one_touch_prob
+from ..services.barrier_pricing import no_touch_prob, norm_cdf, one_touch_prob
 from ..types import HedgeMarketConfig, HedgeOpportunity, Market
 
 
@@ -26,7 +27,8 @@ def load_hedge_markets(path: Path) -> List[HedgeMarketConfig]:
     """
     if not path.exists():
         return []
-    raw = json.loads(path.read_text(encoding="utf-8"))
+    # json.loads 直接接受 UTF-8 字节，省去先解码为 str 的一次拷贝。
+    raw = json.loads(path.read_bytes())
     results: List[HedgeMarketConfig] = []
     if not isinstance(raw, list):
         return results
@@ -86,22 +88,34 @@ async def scan_hedged_opportunities(
     pm_markets = await pm_client.list_active_markets(limit=pm_limit)
     index: dict[str, Market] = {m.market_id: m for m in pm_markets}
     now = datetime.now(tz=timezone.utc)
+    active = [mapping for mapping in mappings if mapping.market_id in index]
+
+    # 同一标的（如多个 BTC 行权价市场）共享标记价格与资金费率，每轮扫描按符号去重后并发拉取一次。
+    symbols = list(dict.fromkeys(mapping.underlying_symbol for mapping in active))
+    spot_results, funding_results = await asyncio.gather(
+        asyncio.gather(*(perp_client.fetch_mark_price(s) for s in symbols), return_exceptions=True),
+        asyncio.gather(*(perp_client.fetch_funding_rate(s) for s in symbols), return_exceptions=True),
+    )
+    mark_prices: dict[str, float] = {
+        s: p for s, p in zip(symbols, spot_results) if not isinstance(p, BaseException)
+    }
+    fundings: dict[str, Optional[float]] = {
+        s: (None if isinstance(f, BaseException) else f) for s, f in zip(symbols, funding_results)
+    }
+    vol_cache: dict[tuple[str, str, int], Optional[float]] = {}
 
     results: List[HedgeOpportunity] = []
-    for mapping in mappings:
-        market = index.get(mapping.market_id)
-        if not market:
+    for mapping in active:
+        market = index[mapping.market_id]
+
+        spot = mark_prices.get(mapping.underlying_symbol)
+        if spot is None:
             continue
 
         quote = await pm_client.get_best_prices(market)
         pm_yes = quote.yes_price
         pm_no = quote.no_price
 
-        try:
-            spot = await perp_client.fetch_mark_price(mapping.underlying_symbol)
-        except Exception:
-            continue
-
         prob_source = "digital"
         prob_above: Optional[float]
         prob: Optional[float]
@@ -167,7 +181,7 @@ async def scan_hedged_opportunities(
         if min_edge_percent is not None and abs(edge_pct) < min_edge_percent:
             continue
 
-        funding = await perp_client.fetch_funding_rate(mapping.underlying_symbol)
+        funding = fundings.get(mapping.underlying_symbol)
         note = "到期时间过短，概率可能失真" if years < (2 / 365) else None
         results.append(
             HedgeOpportunity(
@@ -218,7 +232,7 @@ def _implied_prob_above(spot: float, strike: float, expiry: str, now: datetime,
     if denom <= 0:
         return None, years
     d2 = (math.log(spot / strike) - 0.5 * sigma * sigma * years) / denom
-    return _norm_cdf(d2), years
+    return norm_cdf(d2), years
 
 
 def _parse_expiry(value: str) -> Optional[datetime]:
@@ -240,18 +254,6 @@ def _parse_expiry(value: str) -> Optional[datetime]:
         return None
 
 
-def _norm_cdf(x: float) -> float:
-    """正态分布累积函数。
-
-    Args:
-        x: 自变量。
-
-    Returns:
-        累积概率值。
-    """
-    return 0.5 * (1.0 + math.erf(x / math.sqrt(2.0)))
-
-
 def _implied_touch_prob(
     spot: float,
     barrier: float,
@@ -298,4 +300,3 @@ def _implied_touch_prob(
     else:
         prob = one_touch_prob(spot, barrier, years, sigma, drift=drift, direction=direction)
     return prob, years
-    vol_cache: dict[tuple[str, str, int], Optional[float]] = {}
@@ -10,12 +10,13 @@
 
 from __future__ import annotations
 
+import time
 from dataclasses import dataclass, field
-from datetime import datetime, timezone
+from datetime import datetime
 from typing import Dict, Iterable, List, Optional
 
 from ..connectors.polymarket_ws import PolymarketStreamState
-from ..types import Market, OrderBook, OrderBookLevel, RebalanceSignal
+from ..types import Market, OrderBook, OrderBookLevel, Platform, RebalanceSignal
 
 
 @dataclass
@@ -85,6 +86,7 @@ class RebalanceMonitor:
         max_age_seconds: int = 300,
         min_trades: int = 1,
         now: Optional[datetime] = None,
+        now_ts: Optional[int] = None,
     ) -> List[RebalanceSignal]:
         """基于当前订单簿与最近成交识别再平衡监控信号。
 
@@ -99,20 +101,23 @@ class RebalanceMonitor:
             min_notional: 最近一笔成交的最小名义金额阈值。
             max_age_seconds: 最近成交允许的最大时间间隔（秒）。
             min_trades: 触发信号前要求的最小成交条数。
-            now: 当前时间，主要用于测试注入；缺省为当前 UTC 时间。
+            now: 兼容旧调用的当前时间；新代码请改用 ``now_ts``。
+            now_ts: 当前 Unix 时间戳（秒），主要用于测试注入；缺省为 ``time.time()``。
 
         Returns:
             按价格偏离绝对值降序排列的 :class:`RebalanceSignal` 列表。
         """
-        if now is None:
-            now = datetime.utcnow().replace(tz=timezone.utc)
-        now_ts = int(now.timestamp())
+        # 全程只做整数秒运算；``now`` 仅为兼容旧调用保留，不再构造 datetime。
+        if now_ts is None:
+            now_ts = int(now.timestamp()) if now is not None else int(time.time())
         window_seconds = max_age_seconds
+        min_ts = now_ts - max_age_seconds
 
         results: List[RebalanceSignal] = []
 
         for market in markets:
-            if market.platform.value != "polymarket":
+            # 直接比较枚举成员，避免每次迭代读取 `.value` 再做字符串比较。
+            if market.platform is not Platform.POLYMARKET:
                 continue
             if not market.condition_id or not market.yes_token_id:
                 continue
@@ -125,17 +130,15 @@ class RebalanceMonitor:
             if current_yes is None:
                 continue
 
+            # 只要盘口有效就每轮更新 EMA：平静期的价格构成基线，冲击到来时才能与之比较。
+            # 成交过滤只决定是否输出信号，不影响基线。
             baseline = self._update_baseline(market.condition_id, current_yes)
-            delta = current_yes - baseline
-            if abs(delta) < min_abs_move:
-                # 价格偏离尚不足以构成超调信号。
-                continue
 
-            trades = state.get_last_trades(market.condition_id, limit=50)
-            if len(trades) < min_trades:
+            # min_trades 只统计监控窗口内的成交；只读取环形缓冲尾部，不复制也不修改共享的 state。
+            trade_count, last_trade = state.get_last_trade(market.condition_id, min_ts)
+            if last_trade is None or trade_count < min_trades:
                 continue
 
-            last_trade = trades[-1]
             age = now_ts - int(last_trade.timestamp or 0)
             if age < 0 or age > max_age_seconds:
                 # 最近成交过旧，可能不是短期冲击。
@@ -144,6 +147,11 @@ class RebalanceMonitor:
                 # 成交规模不足以视为鲸鱼或明显情绪波动。
                 continue
 
+            delta = current_yes - baseline
+            if abs(delta) < min_abs_move:
+                # 价格偏离尚不足以构成超调信号。
+                continue
+
             direction = "short_yes" if delta > 0 else "short_no"
             reason_parts: list[str] = []
             move_pct = abs(delta) * 100.0
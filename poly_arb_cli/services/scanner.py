@@ -1,13 +1,47 @@
 from __future__ import annotations
 
+import asyncio
+from dataclasses import dataclass
 from typing import List, Optional
 
 from ..clients.opinion import OpinionClient
 from ..clients.polymarket import PolymarketClient
+from ..config import Settings
 from ..connectors.polymarket_ws import PolymarketStreamState
-from ..types import ArbOpportunity, MatchedMarket, OrderBook
+from ..types import ArbOpportunity, Market, MatchedMarket, OrderBook, Route
 from .matcher import match_markets
-from .pricing import best_price, clamp_slippage, compute_fill
+from .pricing import best_price, compute_fill
+
+# 同时处理的配对数量上限，避免瞬间打满 Polymarket/Opinion 接口限频。
+_MAX_CONCURRENT_PAIRS = 8
+
+# 盘口顶层下界剪枝的浮点容差：均价由 notional / filled 得出，可能比最优价低若干 ulp。
+_PRUNE_EPS = 1e-9
+
+# 套利路线表：(路线, Polymarket 腿, Opinion 腿)，两条路线共用同一套计算逻辑。
+_ROUTES: tuple[tuple[Route, str, str], ...] = (
+    (Route.PM_NO_OP_YES, "PM_NO", "OP_YES"),
+    (Route.PM_YES_OP_NO, "PM_YES", "OP_NO"),
+)
+
+
+@dataclass(slots=True)
+class PairBooks:
+    """单个配对在一次完整准备中拉取到的四个盘口。
+
+    Attributes:
+        pair: 匹配后的市场对。
+        pm_yes: Polymarket YES 盘口（WS 优先，缺失时为 REST 结果）。
+        pm_no: Polymarket NO 盘口。
+        op_yes: Opinion YES 盘口。
+        op_no: Opinion NO 盘口。
+    """
+
+    pair: MatchedMarket
+    pm_yes: OrderBook
+    pm_no: OrderBook
+    op_yes: OrderBook
+    op_no: OrderBook
 
 
 async def scan_once(
@@ -18,93 +52,203 @@ async def scan_once(
     threshold: float = 0.6,
     pm_state: Optional[PolymarketStreamState] = None,
 ) -> List[ArbOpportunity]:
-    """执行一次跨盘套利扫描。
+    """执行一次跨盘套利扫描，即 :func:`prepare_scan` 后接 :func:`evaluate_pairs`。
+
+    Args:
+        polymarket_client: Polymarket 客户端。
+        opinion_client: Opinion 客户端。
+        limit: 每个平台最多拉取的市场数量。
+        threshold: 标题匹配的相似度阈值。
+        pm_state: 可选的 Polymarket WS 本地状态。
+
+    Returns:
+        按利润率降序排列的 `ArbOpportunity` 列表。
+    """
+    snapshot = await prepare_scan(
+        polymarket_client, opinion_client, limit=limit, threshold=threshold, pm_state=pm_state
+    )
+    return evaluate_pairs(snapshot, polymarket_client.settings)
+
+
+async def prepare_scan(
+    polymarket_client: PolymarketClient,
+    opinion_client: OpinionClient,
+    *,
+    limit: int = 50,
+    threshold: float = 0.6,
+    pm_state: Optional[PolymarketStreamState] = None,
+) -> List[PairBooks]:
+    """拉取两侧市场并匹配，再为每个配对准备四个盘口。
 
     优先从本地 PolymarketStreamState 读取盘口（若提供），
     否则退回到 CLOB REST 接口。Opinion 一侧始终使用
-    Open API / SDK。
+    Open API / SDK。单个配对的盘口并发拉取，多个配对
+    之间也并发处理，并用信号量限制同时在途的配对数量。
+
+    Args:
+        polymarket_client: Polymarket 客户端。
+        opinion_client: Opinion 客户端。
+        limit: 每个平台最多拉取的市场数量。
+        threshold: 标题匹配的相似度阈值。
+        pm_state: 可选的 Polymarket WS 本地状态。
+
+    Returns:
+        每个配对一个 :class:`PairBooks`，可交给 :func:`evaluate_pairs` 反复计算。
     """
-    pm_markets = await polymarket_client.list_active_markets(limit=limit)
-    op_markets = await opinion_client.list_active_markets(limit=limit)
+    settings = polymarket_client.settings  # shared config
+    # 配置本身不可能产生机会时（报价规模不足以达到最小成交量，或利润阈值超过 100%）
+    # 直接返回，省去整轮市场与盘口请求。
+    if (
+        settings.default_quote_size <= 0
+        or settings.min_trade_size > settings.default_quote_size
+        or settings.min_profit_percent > 100
+    ):
+        return []
+
+    # 两个平台的市场列表互不依赖，并发拉取以重叠两次网络往返。
+    pm_markets, op_markets = await asyncio.gather(
+        polymarket_client.list_active_markets(limit=limit),
+        opinion_client.list_active_markets(limit=limit),
+    )
+    if not pm_markets or not op_markets:
+        # 任一侧无市场（通常是接口降级）时不做匹配与盘口拉取。
+        return []
     matched = match_markets(pm_markets, op_markets, threshold=threshold)
 
+    semaphore = asyncio.Semaphore(_MAX_CONCURRENT_PAIRS)
+
+    async def _prepare_pair(pair: MatchedMarket) -> PairBooks:
+        async with semaphore:
+            # WS state 覆盖的 Polymarket 盘口直接同步取用，只为缺失的一侧走 REST，
+            # 与 Opinion 两侧盘口一起并发拉取。
+            pm_yes_book = _ws_book(pm_state, pair.polymarket, "yes")
+            pm_no_book = _ws_book(pm_state, pair.polymarket, "no")
+            fetches = [
+                opinion_client.get_orderbook(pair.opinion, side="yes"),
+                opinion_client.get_orderbook(pair.opinion, side="no"),
+            ]
+            if pm_yes_book is None:
+                fetches.append(polymarket_client.get_orderbook(pair.polymarket, side="yes"))
+            if pm_no_book is None:
+                fetches.append(polymarket_client.get_orderbook(pair.polymarket, side="no"))
+            op_yes_book, op_no_book, *pm_fetched = await asyncio.gather(*fetches)
+            if pm_yes_book is None:
+                pm_yes_book = pm_fetched.pop(0)
+            if pm_no_book is None:
+                pm_no_book = pm_fetched.pop(0)
+        return PairBooks(pair, pm_yes_book, pm_no_book, op_yes_book, op_no_book)
+
+    return list(await asyncio.gather(*(_prepare_pair(pair) for pair in matched)))
+
+
+def evaluate_pairs(
+    snapshot: List[PairBooks],
+    settings: Settings,
+    pm_state: Optional[PolymarketStreamState] = None,
+) -> List[ArbOpportunity]:
+    """基于已准备的盘口计算全部配对的套利机会，不发起任何网络请求。
+
+    提供 ``pm_state`` 时 Polymarket 一侧改用其中的最新盘口，缺失时沿用
+    ``snapshot`` 中的盘口；仪表盘据此在 WS 增量到达时只做本地重算。
+
+    Args:
+        snapshot: :func:`prepare_scan` 的结果。
+        settings: 全局配置，提供下单规模、利润与滑点阈值。
+        pm_state: 可选的 Polymarket WS 本地状态。
+
+    Returns:
+        按利润率降序排列的 `ArbOpportunity` 列表。
+    """
     results: List[ArbOpportunity] = []
-    for pair in matched:
-        settings = polymarket_client.settings  # shared config
-        target_size = settings.default_quote_size
-
-        # Fetch Polymarket orderbooks，优先使用本地 WS state。
-        pm_yes_book: OrderBook
-        pm_no_book: OrderBook
-
-        if pm_state is not None:
-            pm_yes_book = pm_state.get_orderbook_for_market(pair.polymarket, side="yes") or OrderBook(bids=[], asks=[])
-            pm_no_book = pm_state.get_orderbook_for_market(pair.polymarket, side="no") or OrderBook(bids=[], asks=[])
-        else:
-            pm_yes_book = OrderBook(bids=[], asks=[])
-            pm_no_book = OrderBook(bids=[], asks=[])
-
-        # 若本地 state 尚未覆盖，回退到 REST 查询。
-        if not pm_yes_book.bids and not pm_yes_book.asks:
-            pm_yes_book = await polymarket_client.get_orderbook(pair.polymarket, side="yes")
-        if not pm_no_book.bids and not pm_no_book.asks:
-            pm_no_book = await polymarket_client.get_orderbook(pair.polymarket, side="no")
-
-        op_yes_book = await opinion_client.get_orderbook(pair.opinion, side="yes")
-        op_no_book = await opinion_client.get_orderbook(pair.opinion, side="no")
-
-        # Route: PM_NO + OP_YES
-        pm_no_best = best_price(pm_no_book, side="buy")
-        op_yes_best = best_price(op_yes_book, side="buy")
-        pm_no_fill = compute_fill(pm_no_book, side="buy", size=target_size)
-        op_yes_fill = compute_fill(op_yes_book, side="buy", size=target_size)
-        size_no_yes = min(pm_no_fill.filled_size, op_yes_fill.filled_size)
-        cost_no_yes = pm_no_fill.average_price + op_yes_fill.average_price
-        profit = (1 - cost_no_yes) * 100
-        if (
-            size_no_yes >= settings.min_trade_size
-            and cost_no_yes < 1
-            and profit >= settings.min_profit_percent
-            and clamp_slippage(pm_no_best, pm_no_fill.average_price, settings.max_slippage_bps)
-            and clamp_slippage(op_yes_best, op_yes_fill.average_price, settings.max_slippage_bps)
-        ):
-            results.append(
-                ArbOpportunity(
-                    pair=pair,
-                    route="PM_NO + OP_YES",
-                    cost=cost_no_yes,
-                    profit_percent=profit,
-                    size=size_no_yes,
-                    max_size=min(pm_no_fill.filled_size, op_yes_fill.filled_size),
-                    price_breakdown=f"PM_NO {pm_no_fill.average_price:.4f} | OP_YES {op_yes_fill.average_price:.4f}",
-                )
-            )
+    for books in snapshot:
+        pm_yes_book = _ws_book(pm_state, books.pair.polymarket, "yes") or books.pm_yes
+        pm_no_book = _ws_book(pm_state, books.pair.polymarket, "no") or books.pm_no
+        results.extend(
+            _evaluate_pair(books.pair, pm_yes_book, pm_no_book, books.op_yes, books.op_no, settings)
+        )
+    return sorted(results, key=lambda opp: opp.profit_percent, reverse=True)
+
+
+def _ws_book(pm_state: Optional[PolymarketStreamState], market: Market, side: str) -> Optional[OrderBook]:
+    """返回本地 WS state 中非空的盘口；未覆盖或为空时返回 ``None``。"""
+    if pm_state is None:
+        return None
+    book = pm_state.get_orderbook_for_market(market, side=side)
+    if book is not None and (book.bids or book.asks):
+        return book
+    return None
+
+
+def _evaluate_pair(
+    pair: MatchedMarket,
+    pm_yes_book: OrderBook,
+    pm_no_book: OrderBook,
+    op_yes_book: OrderBook,
+    op_no_book: OrderBook,
+    settings: Settings,
+) -> List[ArbOpportunity]:
+    """基于已拉取的四个盘口，计算单个配对两条路线的套利机会。
+
+    Args:
+        pair: 匹配后的市场对。
+        pm_yes_book: Polymarket YES 盘口。
+        pm_no_book: Polymarket NO 盘口。
+        op_yes_book: Opinion YES 盘口。
+        op_no_book: Opinion NO 盘口。
+        settings: 全局配置，提供下单规模、利润与滑点阈值。
+
+    Returns:
+        满足阈值的 `ArbOpportunity` 列表（0~2 个）。
+    """
+    target_size = settings.default_quote_size
+    min_trade_size = settings.min_trade_size
+    min_profit_percent = settings.min_profit_percent
+    # 滑点判定改写为乘法形式：|avg - entry| / entry * 1e4 <= bps  <=>  |avg - entry| * 1e4 <= bps * entry。
+    max_slippage_bps = settings.max_slippage_bps
+    books = {
+        "PM_YES": pm_yes_book,
+        "PM_NO": pm_no_book,
+        "OP_YES": op_yes_book,
+        "OP_NO": op_no_book,
+    }
 
-        # Route: PM_YES + OP_NO
-        pm_yes_best = best_price(pm_yes_book, side="buy")
-        op_no_best = best_price(op_no_book, side="buy")
-        pm_yes_fill = compute_fill(pm_yes_book, side="buy", size=target_size)
-        op_no_fill = compute_fill(op_no_book, side="buy", size=target_size)
-        size_yes_no = min(pm_yes_fill.filled_size, op_no_fill.filled_size)
-        cost_yes_no = pm_yes_fill.average_price + op_no_fill.average_price
-        profit = (1 - cost_yes_no) * 100
+    results: List[ArbOpportunity] = []
+    for route, pm_leg, op_leg in _ROUTES:
+        pm_book = books[pm_leg]
+        op_book = books[op_leg]
+        pm_best = best_price(pm_book, side="buy")
+        op_best = best_price(op_book, side="buy")
+        # 买入均价不低于最优卖价，故 pm_best + op_best 是成本下界、对应利润率是上界；
+        # 上界已不达标时无需遍历盘口计算成交均价，结果不变。
+        best_cost = pm_best + op_best
+        if best_cost >= 1 + _PRUNE_EPS or (1 - best_cost) * 100 < min_profit_percent - _PRUNE_EPS:
+            continue
+        pm_fill = compute_fill(pm_book, side="buy", size=target_size)
+        op_fill = compute_fill(op_book, side="buy", size=target_size)
+        pm_avg = pm_fill.average_price
+        op_avg = op_fill.average_price
+        size = min(pm_fill.filled_size, op_fill.filled_size)
+        cost = pm_avg + op_avg
+        profit = (1 - cost) * 100
         if (
-            size_yes_no >= settings.min_trade_size
-            and cost_yes_no < 1
-            and profit >= settings.min_profit_percent
-            and clamp_slippage(pm_yes_best, pm_yes_fill.average_price, settings.max_slippage_bps)
-            and clamp_slippage(op_no_best, op_no_fill.average_price, settings.max_slippage_bps)
+            size >= min_trade_size
+            and cost < 1
+            and profit >= min_profit_percent
+            and pm_best > 0
+            and abs(pm_avg - pm_best) * 10_000 <= max_slippage_bps * pm_best
+            and op_best > 0
+            and abs(op_avg - op_best) * 10_000 <= max_slippage_bps * op_best
         ):
             results.append(
                 ArbOpportunity(
                     pair=pair,
-                    route="PM_YES + OP_NO",
-                    cost=cost_yes_no,
+                    route=route,
+                    cost=cost,
                     profit_percent=profit,
-                    size=size_yes_no,
-                    max_size=min(pm_yes_fill.filled_size, op_no_fill.filled_size),
-                    price_breakdown=f"PM_YES {pm_yes_fill.average_price:.4f} | OP_NO {op_no_fill.average_price:.4f}",
+                    size=size,
+                    max_size=size,
+                    price_breakdown=f"{pm_leg} {pm_avg:.4f} | {op_leg} {op_avg:.4f}",
                 )
             )
 
-    return sorted(results, key=lambda opp: opp.profit_percent, reverse=True)
+    return results
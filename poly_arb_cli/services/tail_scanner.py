@@ -7,17 +7,22 @@
 
 from __future__ import annotations
 
+import asyncio
+import heapq
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import List, Optional
+from typing import Dict, List, Optional, Sequence
 
 from ..clients.polymarket import PolymarketClient
 from ..config import Settings
 from ..connectors.polymarket_ws import PolymarketStreamState
-from ..types import Market, OrderBook, OrderBookLevel
+from ..types import Market, OrderBook, OrderBookLevel, Platform
 
+# 一年的小时数：年化收益率 = 预期收益率 * _HOURS_PER_YEAR / 剩余小时数。
+_HOURS_PER_YEAR = 365.0 * 24.0
 
-@dataclass
+
+@dataclass(slots=True)
 class TailSweepOpportunity:
     """描述单个尾盘扫货机会的数据类。
 
@@ -45,30 +50,43 @@ class TailSweepOpportunity:
 def _parse_end_dt(market: Market) -> Optional[datetime]:
     """将 Market 中的 `end_date` 字段解析为 UTC datetime。
 
+    优先返回 ``market.end_dt_utc`` 缓存；未命中时解析字符串并写回缓存，
+    同一 Market 对象后续扫描无需重复解析。
+
     Args:
         market: 包含 end_date 的市场对象。
 
     Returns:
         UTC 时区的 datetime；若缺失或解析失败则返回 ``None``。
     """
+    if market.end_dt_utc is not None:
+        return market.end_dt_utc
     if not market.end_date:
         return None
-    raw = market.end_date.strip()
+    dt = _parse_end_str(market.end_date.strip())
+    if dt is not None:
+        market.end_dt_utc = dt
+    return dt
+
+
+def _parse_end_str(raw: str) -> Optional[datetime]:
+    """解析 ISO8601 或数值时间戳字符串为 UTC datetime。"""
     try:
         # 支持 "2024-01-01T00:00:00Z" 或带偏移的 ISO8601。
         dt = datetime.fromisoformat(raw.replace("Z", "+00:00"))
         if dt.tzinfo is None:
             dt = dt.replace(tzinfo=timezone.utc)
-        return dt.astimezone(timezone.utc)
+        dt = dt.astimezone(timezone.utc)
     except Exception:
         # 兼容数值时间戳字符串
         try:
             ts = float(raw)
             if ts > 1e11:
                 ts /= 1000.0
-            return datetime.fromtimestamp(ts, tz=timezone.utc)
+            dt = datetime.fromtimestamp(ts, tz=timezone.utc)
         except Exception:
             return None
+    return dt
 
 
 def _hours_to_resolve(market: Market, now: Optional[datetime] = None) -> Optional[float]:
@@ -76,7 +94,7 @@ def _hours_to_resolve(market: Market, now: Optional[datetime] = None) -> Optiona
 
     Args:
         market: 目标市场。
-        now: 当前时间，主要用于测试注入；缺省时取 ``datetime.utcnow``。
+        now: 当前时间，主要用于测试注入；缺省时取 ``datetime.now(timezone.utc)``。
 
     Returns:
         剩余小时数；若 end_date 缺失或已过期则返回 ``None``。
@@ -85,38 +103,79 @@ def _hours_to_resolve(market: Market, now: Optional[datetime] = None) -> Optiona
     if end_dt is None:
         return None
     if now is None:
-        now = datetime.utcnow().replace(tzinfo=timezone.utc)
+        now = datetime.now(timezone.utc)
     if end_dt <= now:
         return None
     delta = end_dt - now
     return delta.total_seconds() / 3600.0
 
 
+def _hours_to_resolve_batch(
+    markets: Sequence[Market],
+    now: datetime,
+    memo: Optional[Dict[str, Optional[float]]] = None,
+) -> List[Optional[float]]:
+    """批量计算一组市场的剩余小时数，语义与逐个调用 `_hours_to_resolve` 相同。
+
+    ``now`` 只转换一次为 epoch 秒，之后每个 end_date 仅做一次浮点减法与除法，
+    不再逐市场构造 timedelta；相同 end_date 字符串的结果记入 ``memo``，
+    同一事件下的多个市场及跨分页的重复值只计算一次。
+
+    Args:
+        markets: 待计算的市场序列。
+        now: 当前 UTC 时间。
+        memo: 可选的 ``{end_date: hours}`` 缓存，跨多次调用复用。
+
+    Returns:
+        与 ``markets`` 一一对应的剩余小时数；缺失、无法解析或已过期为 ``None``。
+    """
+    if memo is None:
+        memo = {}
+    now_ts = now.timestamp()
+    out: List[Optional[float]] = []
+    for m in markets:
+        raw = m.end_date
+        if raw is not None and raw in memo:
+            out.append(memo[raw])
+            continue
+        end_dt = _parse_end_dt(m)
+        seconds = end_dt.timestamp() - now_ts if end_dt is not None else 0.0
+        hours = seconds / 3600.0 if seconds > 0 else None
+        if raw is not None:
+            memo[raw] = hours
+        out.append(hours)
+    return out
+
+
 def _best_ask(book: OrderBook) -> Optional[OrderBookLevel]:
     """返回盘口最优卖一价位。"""
 
     return book.best_ask()
 
 
-def _estimate_fill_size(book: OrderBook, target_size: float) -> float:
-    """在不考虑滑点约束下估算可扫数量。
+def _sweep_depth(book: OrderBook, target_size: float, depth_levels: int = 5) -> tuple[float, float]:
+    """单次遍历卖盘，同时估算可扫数量与前几档深度。
+
+    可扫数量不考虑滑点约束，等于卖盘累计数量与 ``target_size`` 的较小值；
+    一旦已满足目标数量且已覆盖前 ``depth_levels`` 档即提前结束遍历。
 
     Args:
         book: YES 一侧订单簿。
         target_size: 希望扫单的最大数量。
+        depth_levels: 统计深度时覆盖的档位数。
 
     Returns:
-        在盘口前几档中累计可成交的数量（不超过 target_size）。
+        ``(可扫数量, 前 depth_levels 档卖单总量)`` 二元组。
     """
-    remaining = target_size
     filled = 0.0
-    for level in book.asks:
-        if remaining <= 0:
+    top_depth = 0.0
+    for i, level in enumerate(book.asks):
+        if i < depth_levels:
+            top_depth += level.size
+        elif filled >= target_size:
             break
-        take = min(level.size, remaining)
-        filled += take
-        remaining -= take
-    return filled
+        filled += level.size
+    return min(filled, target_size), top_depth
 
 
 async def scan_tail_once(
@@ -130,7 +189,10 @@ async def scan_tail_once(
 
     该函数遵循「先从 WS，本地 state 取盘口，失败时退回 REST」
     的策略，筛选出 Yes 价格接近 1 且即将结算的市场，并按预期
-    收益率与名义金额排序输出机会列表。
+    收益率与名义金额排序输出机会列表。扫描分三阶段：先用市场
+    元数据过滤候选，再并发预取缺失的 REST 盘口（并发数受
+    ``settings.tail_rest_concurrency`` 限制），最后统一打分。前两阶段
+    随 Gamma 分页逐页推进，盘口请求无需等待全部分页拉取完毕。
 
     Args:
         pm_client: Polymarket Gamma/CLOB 客户端实例。
@@ -139,65 +201,114 @@ async def scan_tail_once(
         limit: Gamma 市场列表的最大拉取数量。
 
     Returns:
-        尾盘扫货机会列表，按预期收益率降序排列。
+        尾盘扫货机会列表，按预期收益率降序排列；``settings.tail_top_k``
+        非 ``None`` 时只保留前 K 个。
     """
-    markets = await pm_client.list_active_markets(limit=limit)
-    now = datetime.utcnow().replace(tzinfo=timezone.utc)
-
+    # 配置阈值在循环外一次性绑定为局部变量，避免逐市场重复读取 Settings 属性。
+    max_hours = settings.tail_max_hours_to_resolve
+    min_price = settings.tail_min_yes_price
+    one_minus_fee = 1.0 - settings.tail_fee_rate
+    min_yield = settings.tail_min_yield_percent
+    min_ann = settings.tail_min_annualized_yield_percent
+    min_notional = settings.tail_min_notional
+    target_sweep = min(settings.max_trade_size, settings.tail_max_sweep_size)
+
+    # 盘口只会让可实现收益更低：成交价不低于 min_price，而收益率随价格单调递减，
+    # 因此 min_price 处的收益率是本轮所有机会的上界。上界不达标时无需拉取任何数据；
+    # 否则据此反推年化门槛允许的最大剩余小时数，在拉取盘口前就剔除过远的市场。
+    if min_price > 0:
+        best_yield = (1.0 - min_price) * one_minus_fee / min_price * 100.0
+        if best_yield <= 0 or best_yield < min_yield:
+            return []
+        if min_ann > 0:
+            max_hours = min(max_hours, best_yield * _HOURS_PER_YEAR / min_ann)
+
+    now = datetime.now(timezone.utc)
+    semaphore = asyncio.Semaphore(max(1, settings.tail_rest_concurrency))
+
+    async def _fetch(market: Market) -> OrderBook:
+        async with semaphore:
+            return await pm_client.get_orderbook(market, side="yes")
+
+    # 阶段一、二按 Gamma 分页流水线执行：每到一页即过滤候选并发起该页的盘口请求，
+    # 使后续分页的网络往返与已发出的 CLOB 盘口请求重叠。
+    candidates: list[tuple[Market, float]] = []
+    hours_by_end: dict[str, Optional[float]] = {}
+    books: dict[str, OrderBook] = {}
+    pending: dict[str, asyncio.Future[OrderBook]] = {}
+    seen: set[str] = set()
+    try:
+        async for page in pm_client.iter_market_pages(limit=limit):
+            # 阶段一：仅用市场元数据做廉价过滤，得到候选市场及其剩余小时数。
+            # 剩余小时数按页批量计算，共享 end_date 的市场经 hours_by_end 在整轮扫描内只算一次。
+            # 分页期间市场列表可能变动，同一 market_id 会出现在多页，只保留首次出现的记录。
+            page_markets: list[Market] = []
+            for m in page:
+                if m.market_id in seen:
+                    continue
+                if m.platform is Platform.POLYMARKET and m.yes_token_id and m.end_date:
+                    seen.add(m.market_id)
+                    page_markets.append(m)
+            page_candidates: list[tuple[Market, float]] = [
+                (m, hours)
+                for m, hours in zip(page_markets, _hours_to_resolve_batch(page_markets, now, hours_by_end))
+                if hours is not None and hours <= max_hours
+            ]
+            candidates.extend(page_candidates)
+
+            # 阶段二：优先取 WS state 中的 YES 盘口（每页一次性批量预取），其余立即发起 REST 请求（信号量限流）。
+            ws_books = (
+                pm_state.bulk_ask_snapshot(m.yes_token_id for m, _ in page_candidates)
+                if pm_state is not None
+                else {}
+            )
+            for m, _ in page_candidates:
+                ob = ws_books.get(m.yes_token_id)
+                if ob is not None:
+                    books[m.market_id] = ob
+                else:
+                    pending[m.market_id] = asyncio.ensure_future(_fetch(m))
+
+        if pending:
+            fetched = await asyncio.gather(*pending.values())
+            books.update(zip(pending, fetched))
+    except BaseException:
+        for task in pending.values():
+            task.cancel()
+        raise
+
+    # 阶段三：基于预取的盘口逐个打分与标记风险。
+    # 收益率相关条件只依赖最优卖价与剩余时间，先用这些标量判定；
+    # 只有全部通过的市场才遍历盘口估算可扫规模，各条件为合取关系，结果不变。
     results: list[TailSweepOpportunity] = []
-    for m in markets:
-        if m.platform.value != "polymarket":
-            continue
-        if not m.yes_token_id:
-            continue
-
-        hours = _hours_to_resolve(m, now=now)
-        if hours is None:
-            continue
-        if hours > settings.tail_max_hours_to_resolve:
-            continue
-
-        # 获取 YES 盘口：优先 WS state，退回 REST。
-        book: OrderBook
-        if pm_state is not None:
-            ob = pm_state.get_orderbook_for_market(m, side="yes")
-            book = ob or OrderBook(bids=[], asks=[])
-        else:
-            book = OrderBook(bids=[], asks=[])
-        if not book.asks:
-            book = await pm_client.get_orderbook(m, side="yes")
-        if not book.asks:
-            continue
-
+    for m, hours in candidates:
+        book = books[m.market_id]
         best = _best_ask(book)
         if best is None:
             continue
         price = float(best.price)
-        if price < settings.tail_min_yes_price:
-            continue
-
-        # 估算可扫规模与名义金额。
-        sweep_size = _estimate_fill_size(book, min(settings.max_trade_size, settings.tail_max_sweep_size))
-        if sweep_size <= 0:
-            continue
-        notional = price * sweep_size
-        if notional < settings.tail_min_notional:
+        if price < min_price or hours <= 0:
             continue
 
         # 预期收益率（忽略时间价值）：(1 - price) * (1 - fee) 相对 price。
-        gross_profit = (1.0 - price) * (1.0 - settings.tail_fee_rate)
+        gross_profit = (1.0 - price) * one_minus_fee
         if gross_profit <= 0:
             continue
         expected_yield = (gross_profit / price) * 100.0
-        if expected_yield < settings.tail_min_yield_percent:
+        if expected_yield < min_yield:
             continue
 
         # 基于剩余时间计算简单年化收益率，便于不同到期时间的机会比较。
-        if hours <= 0:
+        annualized_yield = expected_yield * _HOURS_PER_YEAR / hours
+        if annualized_yield < min_ann:
             continue
-        days = hours / 24.0
-        annualized_yield = expected_yield * (365.0 / days)
-        if annualized_yield < settings.tail_min_annualized_yield_percent:
+
+        # 估算可扫规模与名义金额。
+        sweep_size, top_depth = _sweep_depth(book, target_sweep)
+        if sweep_size <= 0:
+            continue
+        notional = price * sweep_size
+        if notional < min_notional:
             continue
 
         # 风险标记：简单版本，仅根据时间窗口与盘口深度做提示。
@@ -205,8 +316,7 @@ async def scan_tail_once(
         if hours > 24:
             flags.append("long_horizon")
         # 盘口前五档总流动性过低则标记为 thin_book。
-        total_size = sum(level.size for level in book.asks[:5])
-        if total_size < sweep_size * 1.2:
+        if top_depth < sweep_size * 1.2:
             flags.append("thin_book")
 
         opp = TailSweepOpportunity(
@@ -221,9 +331,12 @@ async def scan_tail_once(
         )
         results.append(opp)
 
-    # 按预期收益率和名义金额排序，优先高收益、高规模机会。
-    results.sort(key=lambda o: (o.expected_yield_percent, o.notional), reverse=True)
-    return results
+    # 按预期收益率和名义金额排序，优先高收益、高规模机会；只需前 K 个时用堆代替全量排序。
+    top_k = settings.tail_top_k
+    if top_k is None:
+        results.sort(key=lambda o: (o.expected_yield_percent, o.notional), reverse=True)
+        return results
+    return heapq.nlargest(top_k, results, key=lambda o: (o.expected_yield_percent, o.notional))
 
 
 __all__ = ["TailSweepOpportunity", "scan_tail_once"]
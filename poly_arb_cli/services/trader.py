@@ -3,12 +3,16 @@ from __future__ import annotations
 import asyncio
 from typing import Optional
 
-from tenacity import AsyncRetrying, RetryError, retry_if_exception_type, stop_after_attempt, wait_fixed
+import httpx
+from tenacity import AsyncRetrying, RetryError, retry_if_exception, stop_after_attempt, wait_exponential_jitter
 
 from ..config import Settings
 from ..clients.opinion import OpinionClient
 from ..clients.polymarket import PolymarketClient
-from ..types import ArbOpportunity, Platform, TradeLegResult, TradeResult
+from ..types import ArbOpportunity, Platform, Route, TradeLegResult, TradeResult
+
+# (Polymarket side, Opinion side) per route, indexed by the Route value.
+_SIDES: tuple[tuple[str, str], ...] = (("no", "yes"), ("yes", "no"))
 
 
 class Trader:
@@ -25,26 +29,30 @@ class Trader:
         pm_leg = TradeLegResult(platform=Platform.POLYMARKET, market_id=opportunity.pair.polymarket.market_id, side=pm_side, price=opportunity.cost / 2, size=size, status="pending")
         op_leg = TradeLegResult(platform=Platform.OPINION, market_id=opportunity.pair.opinion.market_id, side=op_side, price=opportunity.cost / 2, size=size, status="pending")
 
-        # Place both orders concurrently with retry.
-        try:
-            pm_order_id, op_order_id = await asyncio.gather(
-                self._place_with_retry(self.polymarket_client, pm_leg, opportunity),
-                self._place_with_retry(self.opinion_client, op_leg, opportunity),
-            )
-            pm_leg.order_id, op_leg.order_id = pm_order_id, op_order_id
+        # Place both orders concurrently with retry. return_exceptions keeps a failing leg from
+        # cancelling its sibling mid-flight, so a leg that did get through is always known here
+        # and can be rolled back instead of leaking a resting order.
+        pm_res, op_res = await asyncio.gather(
+            self._place_with_retry(self.polymarket_client, pm_leg, opportunity),
+            self._place_with_retry(self.opinion_client, op_leg, opportunity),
+            return_exceptions=True,
+        )
+        errors = [res for res in (pm_res, op_res) if isinstance(res, BaseException)]
+        if not errors:
+            pm_leg.order_id, op_leg.order_id = pm_res, op_res
             pm_leg.status = "submitted"
             op_leg.status = "submitted"
             success = True
             notes = None
-        except Exception as exc:  # noqa: BLE001
+        else:
             # Attempt rollback: best-effort cancel/hedge.
-            pm_leg.status = pm_leg.status if pm_leg.order_id else "failed"
-            op_leg.status = op_leg.status if op_leg.order_id else "failed"
-            pm_leg.error = pm_leg.error or str(exc)
-            op_leg.error = op_leg.error or str(exc)
+            for leg, res in ((pm_leg, pm_res), (op_leg, op_res)):
+                if isinstance(res, BaseException):
+                    leg.status = "failed"
+                    leg.error = leg.error or str(res)
             await self._rollback(pm_leg, op_leg)
             success = False
-            notes = f"rollback attempted: {exc}"
+            notes = "rollback attempted: " + "; ".join(str(exc) for exc in errors)
 
         return TradeResult(opportunity=opportunity, pm_leg=pm_leg, op_leg=op_leg, success=success, notes=notes)
 
@@ -52,8 +60,8 @@ class Trader:
         try:
             async for attempt in AsyncRetrying(
                 stop=stop_after_attempt(3),
-                wait=wait_fixed(1),
-                retry=retry_if_exception_type(Exception),
+                wait=wait_exponential_jitter(initial=0.1, max=2.0),
+                retry=retry_if_exception(_is_retryable),
                 reraise=True,
             ):
                 with attempt:
@@ -80,25 +88,31 @@ class Trader:
         Best-effort rollback placeholder.
         - If only one leg succeeded, attempt to cancel that leg (if supported) or place a hedge on the same venue.
         """
-        # Attempt cancels if order ids exist
+        # Attempt cancels if order ids exist; both venues are cancelled concurrently so the
+        # naked exposure window is bounded by the slower cancel rather than their sum.
+        legs: list[TradeLegResult] = []
+        cancels = []
         if pm_leg.order_id:
-            try:
-                await self.polymarket_client.cancel_order(pm_leg.order_id)
-            except Exception:
-                pm_leg.error = pm_leg.error or "cancel_failed"
+            legs.append(pm_leg)
+            cancels.append(self.polymarket_client.cancel_order(pm_leg.order_id))
         if op_leg.order_id:
-            try:
-                await self.opinion_client.cancel_order(op_leg.order_id)
-            except Exception:
-                op_leg.error = op_leg.error or "cancel_failed"
+            legs.append(op_leg)
+            cancels.append(self.opinion_client.cancel_order(op_leg.order_id))
+        outcomes = await asyncio.gather(*cancels, return_exceptions=True)
+        for leg, outcome in zip(legs, outcomes):
+            if isinstance(outcome, Exception):
+                leg.error = leg.error or "cancel_failed"
         # Hedging not implemented yet; left as future work.
 
     async def close(self) -> None:
         await asyncio.gather(self.polymarket_client.close(), self.opinion_client.close())
 
-def _route_to_sides(route: str) -> tuple[str, str]:
-    if route == "PM_NO + OP_YES":
-        return ("no", "yes")
-    if route == "PM_YES + OP_NO":
-        return ("yes", "no")
-    raise ValueError(f"Unknown route: {route}")
+def _is_retryable(exc: BaseException) -> bool:
+    """Only transient transport failures and 5xx responses are worth retrying."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code >= 500
+    return isinstance(exc, (httpx.TransportError, asyncio.TimeoutError, ConnectionError))
+
+
+def _route_to_sides(route: Route) -> tuple[str, str]:
+    return _SIDES[route]
@@ -1,19 +1,81 @@
 from __future__ import annotations
 
 import json
-from datetime import datetime
+import threading
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Iterable
+from typing import IO, Any, Iterable, Sequence
 
 DATA_DIR = Path("data")
 DATA_DIR.mkdir(exist_ok=True)
 
+# 复用同一个编码器，输出与 ``json.dumps(rec, ensure_ascii=False)`` 一致。
+_dumps = json.JSONEncoder(ensure_ascii=False).encode
+
+
+class JsonlWriter:
+    """常驻追加句柄的 JSONL 写入器。
+
+    文件只在首次写入时打开一次，之后每批记录拼接为一个字符串、
+    一次 ``write`` 落盘，避免逐批 open/close 与逐条 write 的系统调用开销。
+    内部加锁，可安全地从 ``asyncio.to_thread`` 的工作线程调用。
+    句柄生命周期由持有者负责：长期运行的调用方（如仪表盘）自行创建实例，
+    并在退出路径上调用 :meth:`close`。
+
+    Attributes:
+        path: 目标文件路径。
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._fh: IO[str] | None = None
+        self._lock = threading.Lock()
+
+    def write(self, records: Iterable[dict[str, Any]]) -> None:
+        """序列化并追加一批记录。
+
+        Args:
+            records: 待写入的记录，每条一行。
+        """
+        payload = "".join(_dumps(rec) + "\n" for rec in records)
+        if not payload:
+            return
+        with self._lock:
+            if self._fh is None or self._fh.closed:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._fh = self.path.open("a", encoding="utf-8")
+            self._fh.write(payload)
+            self._fh.flush()
+
+    def write_rows(self, fields: Sequence[str], rows: Iterable[Sequence[Any]]) -> None:
+        """按列名序列化并追加一批元组行，输出格式与 :meth:`write` 相同。
+
+        调用方只需缓存轻量元组，字段名到值的映射推迟到写盘时（通常在工作线程中）完成。
+
+        Args:
+            fields: 列名，与每行元组一一对应。
+            rows: 待写入的元组行。
+        """
+        self.write(dict(zip(fields, row)) for row in rows)
+
+    def close(self) -> None:
+        """关闭底层文件句柄（可重复调用）。"""
+        with self._lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+
+
+# 跨盘套利机会快照的列顺序，供仪表盘等高频调用方以元组行缓存。
+OPPORTUNITY_FIELDS: tuple[str, ...] = ("ts", "route", "pm_id", "op_id", "size", "cost", "profit_pct", "breakdown")
+
 
 def _append_jsonl(path: Path, records: Iterable[dict[str, Any]]) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("a", encoding="utf-8") as f:
-        for rec in records:
-            f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+    writer = JsonlWriter(path)
+    try:
+        writer.write(records)
+    finally:
+        writer.close()
 
 
 def log_opportunities(records: Iterable[dict[str, Any]], file_name: str = "opportunities.jsonl") -> None:
@@ -25,4 +87,4 @@ def log_trades(records: Iterable[dict[str, Any]], file_name: str = "trades.jsonl
 
 
 def timestamp() -> str:
-    return datetime.utcnow().isoformat() + "Z"
+    return datetime.now(timezone.utc).replace(tzinfo=None).isoformat() + "Z"
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from bisect import bisect_left
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from enum import Enum
+from enum import Enum, IntEnum
 from typing import Optional
 
 
@@ -26,7 +27,7 @@ class Tag:
     slug: str
 
 
-@dataclass
+@dataclass(slots=True)
 class Market:
     """统一描述各平台市场元数据的数据类。
 
@@ -42,6 +43,8 @@ class Market:
         volume: 24 小时成交量（若平台提供）。
         liquidity: 当前流动性指标（若平台提供）。
         tags: 原始标签列表（如 Polymarket Gamma `tags` 字段）。
+        end_dt_utc: `end_date` 解析后的 UTC datetime 缓存，由客户端构造时填充或
+            在首次解析时写入；不参与比较与 repr。
     """
 
     platform: Platform
@@ -55,9 +58,10 @@ class Market:
     volume: Optional[float] = None
     liquidity: Optional[float] = None
     tags: Optional[list[str]] = None
+    end_dt_utc: Optional[datetime] = field(default=None, compare=False, repr=False)
 
 
-@dataclass
+@dataclass(slots=True)
 class PriceQuote:
     yes_price: float
     no_price: float
@@ -66,35 +70,113 @@ class PriceQuote:
     no_liquidity: Optional[float] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class OrderBookLevel:
     price: float
     size: float
 
 
-@dataclass
+@dataclass(slots=True)
 class OrderBook:
+    """单个 token 的订单簿。
+
+    约定 ``bids`` 按价格降序、``asks`` 按价格升序排列，最优价始终位于下标 0，
+    因此 :meth:`best_bid` / :meth:`best_ask` 为 O(1) 读取，无需额外缓存或失效处理。
+    增量更新应通过 :meth:`apply_delta` 完成以维持该有序性。
+    """
+
     bids: list[OrderBookLevel]
     asks: list[OrderBookLevel]
 
+    @classmethod
+    def from_unsorted(cls, bids: list[OrderBookLevel], asks: list[OrderBookLevel]) -> "OrderBook":
+        """由任意顺序的价位构造订单簿，构造时一次排序建立最优价在前的约定。
+
+        REST/WS 数据源不保证档位顺序（部分接口按由劣到优返回），在入口处
+        排序后，下游的最优价读取、增量更新与基于最优价的剪枝才成立。
+
+        Args:
+            bids: 买盘价位，顺序任意；原地排序为价格降序。
+            asks: 卖盘价位，顺序任意；原地排序为价格升序。
+
+        Returns:
+            满足排序约定的 `OrderBook`。
+        """
+        bids.sort(key=_ask_key, reverse=True)
+        asks.sort(key=_ask_key)
+        return cls(bids=bids, asks=asks)
+
     def best_bid(self) -> Optional[OrderBookLevel]:
         return self.bids[0] if self.bids else None
 
     def best_ask(self) -> Optional[OrderBookLevel]:
         return self.asks[0] if self.asks else None
 
+    def apply_delta(self, side: str, price: float, size: float) -> bool:
+        """在有序价位列表中二分定位 price，并原地更新、删除或插入该档。
 
-@dataclass
+        Args:
+            side: ``BUY`` 更新买盘，``SELL`` 更新卖盘（大小写不敏感）。
+            price: 价位。
+            size: 该价位的最新数量；不大于 0 表示撤掉该档。
+
+        Returns:
+            ``side`` 可识别时返回 ``True``，否则不做修改并返回 ``False``。
+        """
+        side = side.upper()
+        if side == "BUY":
+            levels, key, key_fn = self.bids, -price, _bid_key
+        elif side == "SELL":
+            levels, key, key_fn = self.asks, price, _ask_key
+        else:
+            return False
+        idx = bisect_left(levels, key, key=key_fn)
+        if idx < len(levels) and levels[idx].price == price:
+            if size > 0:
+                levels[idx].size = size
+            else:
+                del levels[idx]
+        elif size > 0:
+            levels.insert(idx, OrderBookLevel(price=price, size=size))
+        return True
+
+
+def _bid_key(level: OrderBookLevel) -> float:
+    """买盘按价格降序排列，取负值后可直接用 bisect 定位。"""
+    return -level.price
+
+
+def _ask_key(level: OrderBookLevel) -> float:
+    """卖盘按价格升序排列。"""
+    return level.price
+
+
+class Route(IntEnum):
+    """跨盘套利路线，取值可直接作为路线查找表的下标。"""
+
+    PM_NO_OP_YES = 0
+    PM_YES_OP_NO = 1
+
+    @property
+    def label(self) -> str:
+        """展示与日志使用的路线名，如 ``"PM_NO + OP_YES"``。"""
+        return _ROUTE_LABELS[self]
+
+
+_ROUTE_LABELS: tuple[str, ...] = ("PM_NO + OP_YES", "PM_YES + OP_NO")
+
+
+@dataclass(slots=True)
 class MatchedMarket:
     polymarket: Market
     opinion: Market
     similarity: Optional[float] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ArbOpportunity:
     pair: MatchedMarket
-    route: str  # "PM_NO + OP_YES" or "PM_YES + OP_NO"
+    route: Route
     cost: float
     profit_percent: float
     size: Optional[float] = None
@@ -111,7 +193,7 @@ class Position:
     available: Optional[float] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class TradeLegResult:
     platform: Platform
     market_id: str
@@ -123,7 +205,7 @@ class TradeLegResult:
     error: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class TradeResult:
     opportunity: ArbOpportunity
     pm_leg: TradeLegResult
@@ -132,7 +214,7 @@ class TradeResult:
     notes: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class TradeEvent:
     """Polymarket 单笔成交事件。
 
@@ -200,7 +282,7 @@ class HedgeMarketConfig:
     vol_timeframe: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class HedgeOpportunity:
     """中性对冲扫描机会的描述体。
 
@@ -235,7 +317,7 @@ class HedgeOpportunity:
     barrier: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class RebalanceSignal:
     """描述单个市场再平衡监控信号的数据类。
 
@@ -1,5 +1,16 @@
 """User-facing UI components (CLI/TUI)."""
 
-from .dashboard import run_dashboard
+from __future__ import annotations
+
+from typing import Any
 
 __all__ = ["run_dashboard"]
+
+
+def __getattr__(name: str) -> Any:
+    # 延迟导入 textual 仪表盘，使不依赖 TUI 的子模块（如 ui.rows）可单独导入。
+    if name == "run_dashboard":
+        from .dashboard import run_dashboard
+
+        return run_dashboard
+    raise AttributeError(name)
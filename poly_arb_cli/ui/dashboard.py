@@ -1,17 +1,27 @@
 from __future__ import annotations
 
 import asyncio
+import time
 from typing import Optional
 
 from textual.app import App, ComposeResult
 from textual.containers import Horizontal
 from textual.widgets import DataTable, Footer, Header, Static
+from textual.widgets.data_table import ColumnKey
 
 from ..clients.opinion import OpinionClient
 from ..clients.polymarket import PolymarketClient
 from ..config import Settings
-from ..services.scanner import scan_once
+from ..connectors.polymarket_ws import MarketWsFeed, PolymarketStreamState
+from ..services.scanner import PairBooks, evaluate_pairs, prepare_scan
+from ..storage import DATA_DIR, OPPORTUNITY_FIELDS, JsonlWriter, timestamp
 from ..types import ArbOpportunity
+from .rows import PROFIT_COLUMN, diff_rows, opportunities_key, opportunity_log_rows, opportunity_rows
+
+# WS 增量触发刷新后的最短间隔：合并突发增量，限制本地重算与表格重绘的频率。
+_MIN_REFRESH_SECONDS = 1.0
+# 机会快照先缓存在内存中，按该间隔批量落盘，避免每次刷新都在 UI 事件循环上写文件。
+_LOG_FLUSH_SECONDS = 5.0
 
 
 class DashboardApp(App):
@@ -29,11 +39,25 @@ class DashboardApp(App):
         self.op_client: Optional[OpinionClient] = None
         self.table: Optional[DataTable] = None
         self.status_text: Optional[Static] = None
+        self.pm_state = PolymarketStreamState()
         self._refresh_task: Optional[asyncio.Task] = None
+        self._feed_task: Optional[asyncio.Task] = None
+        self._feed_ids: frozenset[str] = frozenset()
+        # 最近一次完整准备的配对盘口；WS 增量到达时只基于它做本地重算。
+        self._snapshot: list[PairBooks] = []
+        self._scan_error: Optional[str] = None
+        self._last_key: Optional[tuple] = None
+        self._log_buffer: list[tuple] = []
+        # 仪表盘持有机会日志写入器，文件在首次 flush 时打开，on_unmount 中关闭。
+        self._log_writer = JsonlWriter(DATA_DIR / "opportunities.jsonl")
+        self._log_task: Optional[asyncio.Task] = None
+        self._log_stop = asyncio.Event()
+        self._columns: list[ColumnKey] = []
+        self._row_cache: dict[str, tuple[str, ...]] = {}
 
     def compose(self) -> ComposeResult:
         self.table = DataTable(zebra_stripes=True)
-        self.table.add_columns("Route", "PM ID", "OP ID", "Size", "Cost", "Profit %", "Breakdown")
+        self._columns = self.table.add_columns("Route", "PM ID", "OP ID", "Size", "Cost", "Profit %", "Breakdown")
         self.status_text = Static("Loading...", classes="status")
         yield Header()
         yield Horizontal(self.table, self.status_text)
@@ -42,58 +66,138 @@ class DashboardApp(App):
     async def on_mount(self) -> None:
         self.pm_client, self.op_client = self._build_clients()
         self._refresh_task = asyncio.create_task(self._refresh_loop())
+        self._log_task = asyncio.create_task(self._flush_log_loop())
 
     async def on_unmount(self) -> None:
         if self._refresh_task:
             self._refresh_task.cancel()
-        if self.pm_client and self.op_client:
-            await asyncio.gather(self.pm_client.close(), self.op_client.close())
+        if self._feed_task:
+            self._feed_task.cancel()
+        # 不直接取消落盘任务：通知其做完最后一次 flush 后自行退出，避免末批记录
+        # 在写盘途中被取消而丢失，也保证关闭写入器时没有在途写入。
+        self._log_stop.set()
+        try:
+            if self._log_task:
+                await self._log_task
+            else:
+                await self._flush_log()
+        finally:
+            self._log_writer.close()
+            if self.pm_client and self.op_client:
+                await asyncio.gather(self.pm_client.close(), self.op_client.close())
 
     async def _refresh_loop(self) -> None:
+        # 每 scan_interval_seconds 做一次完整准备：列市场、匹配、拉取 Opinion 盘口与 WS 未覆盖的
+        # Polymarket 盘口，并据此更新 WS 订阅；其间的 WS 增量只用本地盘口重算，不发起 REST 请求。
+        next_full = 0.0
         while True:
-            await self._refresh_data()
-            await asyncio.sleep(self.settings.scan_interval_seconds)
-
-    async def _refresh_data(self) -> None:
-        if not self.pm_client or not self.op_client or not self.table:
+            seen = self.pm_state.version
+            if time.monotonic() >= next_full:
+                await self._prepare()
+                next_full = time.monotonic() + self.settings.scan_interval_seconds
+            self._refresh_data()
+            await asyncio.sleep(_MIN_REFRESH_SECONDS)
+            remaining = max(0.0, next_full - time.monotonic())
+            await self.pm_state.wait_for_update(seen, timeout=remaining)
+
+    async def _prepare(self) -> None:
+        """完整准备一次配对盘口；失败时保留上一份快照，错误显示在状态栏。"""
+        if not self.pm_client or not self.op_client:
             return
-        opportunities = await scan_once(self.pm_client, self.op_client, limit=self.limit, threshold=self.threshold)
-        self._render_opportunities(opportunities)
-        if self.status_text:
-            self.status_text.update(f"Found {len(opportunities)} opps | interval {self.settings.scan_interval_seconds}s")
-        # persist snapshot
-        from ..storage import log_opportunities, timestamp  # local import to avoid cycles
-
-        log_opportunities(
-            [
-                {
-                    "ts": timestamp(),
-                    "route": opp.route,
-                    "pm_id": opp.pair.polymarket.market_id,
-                    "op_id": opp.pair.opinion.market_id,
-                    "size": opp.size,
-                    "cost": opp.cost,
-                    "profit_pct": opp.profit_percent,
-                    "breakdown": opp.price_breakdown,
-                }
-                for opp in opportunities
-            ]
+        try:
+            snapshot = await prepare_scan(
+                self.pm_client,
+                self.op_client,
+                limit=self.limit,
+                threshold=self.threshold,
+                pm_state=self.pm_state,
+            )
+        except Exception as exc:  # noqa: BLE001
+            self._scan_error = str(exc) or type(exc).__name__
+            return
+        self._scan_error = None
+        self._snapshot = snapshot
+        self._sync_feed(snapshot)
+
+    def _sync_feed(self, snapshot: list[PairBooks]) -> None:
+        """订阅本轮配对的 Polymarket YES/NO token；集合变化时重启 feed 以重新订阅。"""
+        asset_ids = frozenset(
+            token
+            for books in snapshot
+            for token in (books.pair.polymarket.yes_token_id, books.pair.polymarket.no_token_id)
+            if token
         )
+        if asset_ids == self._feed_ids and self._feed_task and not self._feed_task.done():
+            return
+        if self._feed_task:
+            self._feed_task.cancel()
+            self._feed_task = None
+        self._feed_ids = asset_ids
+        if asset_ids:
+            feed = MarketWsFeed(self.settings, self.pm_state, asset_ids)
+            self._feed_task = asyncio.create_task(feed.run())
+
+    def _refresh_data(self) -> None:
+        if not self.table:
+            return
+        opportunities = evaluate_pairs(self._snapshot, self.settings, self.pm_state)
+        if self.status_text:
+            status = (
+                f"Found {len(opportunities)} opps | ws v{self.pm_state.version} | "
+                f"full scan every {self.settings.scan_interval_seconds}s"
+            )
+            if self._scan_error:
+                status += f" | last full scan failed: {self._scan_error}"
+            self.status_text.update(status)
+        # 只有无关市场跳动时扫描结果不变，此时跳过表格重绘与重复落盘。
+        key = opportunities_key(opportunities)
+        if key == self._last_key:
+            return
+        self._last_key = key
+        self._render_opportunities(opportunities)
+        # persist snapshot (buffered; flushed by _flush_log_loop)
+        self._log_buffer.extend(opportunity_log_rows(opportunities, timestamp()))
+
+    async def _flush_log_loop(self) -> None:
+        """每隔 ``_LOG_FLUSH_SECONDS`` 落盘一次；收到停止信号后再 flush 一次并退出。"""
+        while not self._log_stop.is_set():
+            try:
+                await asyncio.wait_for(self._log_stop.wait(), _LOG_FLUSH_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            await self._flush_log()
+
+    async def _flush_log(self) -> None:
+        """将缓存的机会快照一次性写入 JSONL，写盘在工作线程中完成。
+
+        写盘失败时丢弃该批记录并在状态栏提示，避免落盘任务退出后缓存无限增长。
+        """
+        if not self._log_buffer:
+            return
+        rows, self._log_buffer = self._log_buffer, []
+        try:
+            await asyncio.to_thread(self._log_writer.write_rows, OPPORTUNITY_FIELDS, rows)
+        except Exception as exc:  # noqa: BLE001
+            if self.status_text:
+                self.status_text.update(f"Log write failed, dropped {len(rows)} rows: {exc}")
 
     def _render_opportunities(self, opportunities: list[ArbOpportunity]) -> None:
+        """按 (route, pm_id, op_id) 对表格做增量更新，只改动新增、消失或数值变化的行。"""
         if not self.table:
             return
-        self.table.clear()
-        for opp in opportunities:
-            self.table.add_row(
-                opp.route,
-                opp.pair.polymarket.market_id,
-                opp.pair.opinion.market_id,
-                f"{opp.size or 0:.2f}",
-                f"{opp.cost:.4f}",
-                f"{opp.profit_percent:.2f}",
-                opp.price_breakdown or "",
-            )
+        table = self.table
+        rows = opportunity_rows(opportunities)
+        diff = diff_rows(self._row_cache, rows)
+        for key in diff.removed:
+            table.remove_row(key)
+        for key in diff.added:
+            table.add_row(*rows[key], key=key)
+        for key, col, value in diff.updated:
+            table.update_cell(key, self._columns[col], value)
+        self._row_cache = rows
+        # 新增行追加在末尾，利润率变化也可能改变名次；仅在这两种情况下按利润率重新排序。
+        if diff.reorder:
+            table.sort(self._columns[PROFIT_COLUMN], key=float, reverse=True)
 
     def _build_clients(self) -> tuple[PolymarketClient, OpinionClient]:
         return PolymarketClient(self.settings), OpinionClient(self.settings)
@@ -0,0 +1,138 @@
+"""仪表盘表格行与日志行的纯函数辅助。
+
+本模块不依赖 textual，负责把扫描结果转换为表格行、计算两轮表格之间的
+增量差异、生成结果指纹以及按 ``OPPORTUNITY_FIELDS`` 顺序构造日志元组，
+便于脱离 TUI 单独测试。
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from operator import attrgetter
+
+from ..types import ArbOpportunity
+
+# 利润率列在表格行中的下标，排序与重排判断都以该列为准。
+PROFIT_COLUMN = 5
+
+# 表格行所需字段一次性取出；格式化使用预先绑定的 str.format，避免逐行重复解析格式串。
+_ROW_FIELDS = attrgetter(
+    "route",
+    "pair.polymarket.market_id",
+    "pair.opinion.market_id",
+    "size",
+    "cost",
+    "profit_percent",
+    "price_breakdown",
+)
+_FMT_2DP = "{:.2f}".format
+_FMT_4DP = "{:.4f}".format
+
+
+@dataclass(slots=True)
+class RowDiff:
+    """两轮表格行之间的增量差异。
+
+    Attributes:
+        removed: 需要删除的行 key。
+        added: 需要新增的行 key，按新结果中的顺序排列。
+        updated: 需要改写的单元格，元素为 ``(行 key, 列下标, 新值)``。
+        reorder: 是否需要按利润率重新排序（有新增行或利润率变化时为 ``True``）。
+    """
+
+    removed: list[str] = field(default_factory=list)
+    added: list[str] = field(default_factory=list)
+    updated: list[tuple[str, int, str]] = field(default_factory=list)
+    reorder: bool = False
+
+
+def opportunity_rows(opportunities: list[ArbOpportunity]) -> dict[str, tuple[str, ...]]:
+    """将扫描结果转换为以 ``route|pm_id|op_id`` 为 key 的表格行。
+
+    Args:
+        opportunities: 本轮扫描结果。
+
+    Returns:
+        ``{行 key: 各列展示字符串}``，保持输入顺序。
+    """
+    rows: dict[str, tuple[str, ...]] = {}
+    for opp in opportunities:
+        route, pm_id, op_id, size, cost, profit, breakdown = _ROW_FIELDS(opp)
+        label = route.label
+        rows[f"{label}|{pm_id}|{op_id}"] = (
+            label,
+            pm_id,
+            op_id,
+            _FMT_2DP(size or 0),
+            _FMT_4DP(cost),
+            _FMT_2DP(profit),
+            breakdown or "",
+        )
+    return rows
+
+
+def diff_rows(old: dict[str, tuple[str, ...]], new: dict[str, tuple[str, ...]]) -> RowDiff:
+    """计算从 ``old`` 到 ``new`` 所需的最小表格改动。
+
+    Args:
+        old: 上一轮已渲染的表格行。
+        new: 本轮表格行。
+
+    Returns:
+        描述删除、新增、单元格改写与是否重排的 :class:`RowDiff`。
+    """
+    diff = RowDiff(removed=[key for key in old if key not in new])
+    for key, values in new.items():
+        prev = old.get(key)
+        if prev is None:
+            diff.added.append(key)
+            diff.reorder = True
+        elif prev != values:
+            diff.updated.extend(
+                (key, col, value)
+                for col, (value, before) in enumerate(zip(values, prev))
+                if value != before
+            )
+            diff.reorder = diff.reorder or values[PROFIT_COLUMN] != prev[PROFIT_COLUMN]
+    return diff
+
+
+def opportunities_key(opportunities: list[ArbOpportunity]) -> tuple:
+    """由决定展示内容的字段组成扫描结果指纹，用于判断两轮结果是否相同。"""
+    return tuple(
+        (
+            opp.route,
+            opp.pair.polymarket.market_id,
+            opp.pair.opinion.market_id,
+            opp.size,
+            opp.cost,
+            opp.profit_percent,
+            opp.price_breakdown,
+        )
+        for opp in opportunities
+    )
+
+
+def opportunity_log_rows(opportunities: list[ArbOpportunity], ts: str) -> list[tuple]:
+    """按 ``storage.OPPORTUNITY_FIELDS`` 的列顺序构造日志元组，转 dict 推迟到写盘线程。
+
+    Args:
+        opportunities: 本轮扫描结果。
+        ts: 本批记录共用的时间戳。
+
+    Returns:
+        与 ``OPPORTUNITY_FIELDS`` 一一对应的元组列表。
+    """
+    return [
+        (
+            ts,
+            opp.route.label,
+            opp.pair.polymarket.market_id,
+            opp.pair.opinion.market_id,
+            opp.size,
+            opp.cost,
+            opp.profit_percent,
+            opp.price_breakdown,
+        )
+        for opp in opportunities
+    ]
@@ -30,3 +30,18 @@ def test_no_touch_complements_touch() -> None:
     nt = no_touch_prob(spot=100, barrier=120, years=0.2, vol=0.4)
     assert touch is not None and nt is not None
     assert math.isclose((touch + nt), 1.0, rel_tol=1e-3, abs_tol=1e-3)
+
+
+def test_one_touch_tail_has_no_cancellation_error() -> None:
+    # z ≈ 7.75：1 - N(z) 约 4.6e-15，相减形式只剩一两位有效数字。
+    far = one_touch_prob(spot=100, barrier=200, years=0.2, vol=0.2)
+    z = math.log(2.0) / (0.2 * math.sqrt(0.2))
+    assert far is not None
+    assert math.isclose(far, math.erfc(z / math.sqrt(2.0)), rel_tol=1e-12)
+
+
+def test_deep_otm_barrier_short_circuits() -> None:
+    touch = one_touch_prob(spot=100, barrier=300, years=0.2, vol=0.2)
+    nt = no_touch_prob(spot=100, barrier=300, years=0.2, vol=0.2)
+    assert touch == 0.0
+    assert nt == 1.0
@@ -0,0 +1,65 @@
+"""仪表盘表格行与日志行纯函数辅助的基础单元测试（不依赖 textual）。"""
+
+from __future__ import annotations
+
+from poly_arb_cli.storage import OPPORTUNITY_FIELDS
+from poly_arb_cli.types import ArbOpportunity, Market, MatchedMarket, Platform, Route
+from poly_arb_cli.ui.rows import diff_rows, opportunities_key, opportunity_log_rows, opportunity_rows
+
+
+def _opp(pm_id: str, profit: float, breakdown: str = "PM_NO 0.4000 | OP_YES 0.5000") -> ArbOpportunity:
+    pair = MatchedMarket(
+        polymarket=Market(platform=Platform.POLYMARKET, market_id=pm_id, title="T"),
+        opinion=Market(platform=Platform.OPINION, market_id="op1", title="T"),
+    )
+    return ArbOpportunity(
+        pair=pair,
+        route=Route.PM_NO_OP_YES,
+        cost=1 - profit / 100,
+        profit_percent=profit,
+        size=10.0,
+        price_breakdown=breakdown,
+    )
+
+
+def test_opportunities_key_tracks_breakdown_changes() -> None:
+    """成本与规模不变但两腿价格互相抵消时，指纹仍应变化。"""
+
+    before = _opp("pm1", 10.0)
+    after = _opp("pm1", 10.0, breakdown="PM_NO 0.4500 | OP_YES 0.4500")
+
+    assert opportunities_key([before]) == opportunities_key([_opp("pm1", 10.0)])
+    assert opportunities_key([before]) != opportunities_key([after])
+
+
+def test_diff_rows_reports_minimal_changes() -> None:
+    """删除、新增、单元格改写与重排标记应与两轮结果的差异一致。"""
+
+    old = opportunity_rows([_opp("a", 10.0), _opp("b", 5.0)])
+
+    same = diff_rows(old, dict(old))
+    assert (same.removed, same.added, same.updated, same.reorder) == ([], [], [], False)
+
+    breakdown_only = diff_rows(old, opportunity_rows([_opp("a", 10.0, breakdown="x"), _opp("b", 5.0)]))
+    assert breakdown_only.updated == [("PM_NO + OP_YES|a|op1", 6, "x")]
+    assert not breakdown_only.reorder
+
+    new = opportunity_rows([_opp("b", 12.0), _opp("c", 1.0)])
+    diff = diff_rows(old, new)
+    assert diff.removed == ["PM_NO + OP_YES|a|op1"]
+    assert diff.added == ["PM_NO + OP_YES|c|op1"]
+    assert ("PM_NO + OP_YES|b|op1", 5, "12.00") in diff.updated
+    assert diff.reorder
+
+
+def test_opportunity_log_rows_follow_storage_fields() -> None:
+    """日志元组与 OPPORTUNITY_FIELDS 对齐，可直接 zip 成落盘记录。"""
+
+    (row,) = opportunity_log_rows([_opp("pm1", 10.0)], ts="2024-01-01T00:00:00Z")
+    record = dict(zip(OPPORTUNITY_FIELDS, row))
+
+    assert record["ts"] == "2024-01-01T00:00:00Z"
+    assert record["route"] == "PM_NO + OP_YES"
+    assert (record["pm_id"], record["op_id"]) == ("pm1", "op1")
+    assert record["profit_pct"] == 10.0
+    assert record["breakdown"] == "PM_NO 0.4000 | OP_YES 0.5000"
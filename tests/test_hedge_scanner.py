@@ -0,0 +1,71 @@
+"""对冲机会扫描 scan_hedged_opportunities 的基础单元测试。"""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from poly_arb_cli.services.hedge_scanner import scan_hedged_opportunities
+from poly_arb_cli.types import HedgeMarketConfig, Market, Platform, PriceQuote
+
+
+class _FakePmClient:
+    """返回固定市场与报价的 Polymarket 测试客户端。"""
+
+    def __init__(self, markets: list[Market]):
+        self.markets = markets
+
+    async def list_active_markets(self, limit: int = 50) -> list[Market]:
+        return self.markets[:limit]
+
+    async def get_best_prices(self, market: Market) -> PriceQuote:
+        return PriceQuote(yes_price=0.2, no_price=0.8)
+
+
+class _FakePerpClient:
+    """记录调用次数的衍生品行情测试客户端。"""
+
+    def __init__(self) -> None:
+        self.mark_calls: list[str] = []
+        self.funding_calls: list[str] = []
+
+    async def fetch_mark_price(self, symbol: str) -> float:
+        self.mark_calls.append(symbol)
+        return 100_000.0
+
+    async def fetch_funding_rate(self, symbol: str) -> Optional[float]:
+        self.funding_calls.append(symbol)
+        return 0.0001
+
+    async def fetch_realized_vol(self, symbol: str, **_: object) -> Optional[float]:
+        return 0.5
+
+
+def test_scan_hedged_dedupes_perp_requests_per_symbol() -> None:
+    """同一标的的多个映射只应拉取一次标记价格与资金费率。"""
+
+    expiry = (datetime.now(timezone.utc) + timedelta(days=30)).isoformat()
+    markets = [
+        Market(platform=Platform.POLYMARKET, market_id=str(i), title=f"BTC above {k}")
+        for i, k in enumerate((90_000, 100_000, 110_000))
+    ]
+    mappings = [
+        HedgeMarketConfig(market_id=m.market_id, underlying_symbol="BTC/USDT:USDT", strike=k, expiry=expiry)
+        for m, k in zip(markets, (90_000.0, 100_000.0, 110_000.0))
+    ]
+    perp = _FakePerpClient()
+
+    results = asyncio.run(
+        scan_hedged_opportunities(
+            _FakePmClient(markets),  # type: ignore[arg-type]
+            perp,  # type: ignore[arg-type]
+            mappings,
+            min_edge_percent=None,
+        )
+    )
+
+    assert len(results) == 3
+    assert perp.mark_calls == ["BTC/USDT:USDT"]
+    assert perp.funding_calls == ["BTC/USDT:USDT"]
+    assert all(opp.funding_rate == 0.0001 for opp in results)
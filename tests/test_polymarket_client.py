@@ -0,0 +1,70 @@
+"""Polymarket 客户端分页拉取市场的基础单元测试。"""
+
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+
+from poly_arb_cli.clients.polymarket import _HTTP_LIMITS, PolymarketClient
+from poly_arb_cli.config import Settings
+from poly_arb_cli.types import Market, Platform
+
+
+def test_iter_market_pages_follows_offsets_until_short_page() -> None:
+    """按 offset 逐页请求，遇到不足一页的响应即停止。"""
+
+    total = 5
+    seen: list[tuple[int, int]] = []
+
+    def _handler(request: httpx.Request) -> httpx.Response:
+        limit = int(request.url.params["limit"])
+        offset = int(request.url.params.get("offset", 0))
+        seen.append((offset, limit))
+        rows = [
+            {"id": str(i), "question": f"Q{i}", "clobTokenIds": f'["y{i}", "n{i}"]'}
+            for i in range(offset, min(offset + limit, total))
+        ]
+        return httpx.Response(200, json=rows)
+
+    async def _run() -> list[list[str]]:
+        client = PolymarketClient(Settings.load())
+        await client._http.aclose()
+        client._http = httpx.AsyncClient(base_url="https://gamma.test", transport=httpx.MockTransport(_handler))
+        async with client:
+            return [[m.market_id for m in page] async for page in client.iter_market_pages(limit=10, page_size=2)]
+
+    pages = asyncio.run(_run())
+
+    assert pages == [["0", "1"], ["2", "3"], ["4"]]
+    assert seen == [(0, 2), (2, 2), (4, 2)]
+
+
+def test_http_limits_keep_default_cap_and_widen_keepalive() -> None:
+    """连接池保留 httpx 默认的连接上限，只放宽 keep-alive 连接数。"""
+
+    assert _HTTP_LIMITS.max_connections == 100
+    assert _HTTP_LIMITS.max_keepalive_connections == 64
+
+
+def test_get_orderbook_sorts_rest_levels_best_first() -> None:
+    """REST 返回的档位顺序不可靠，解析后买盘按价格降序、卖盘按价格升序。"""
+
+    class _Summary:
+        bids = [{"price": "0.40", "size": "1"}, {"price": "0.45", "size": "2"}, {"price": "0.42", "size": "3"}]
+        asks = [{"price": "0.60", "size": "1"}, {"price": "0.55", "size": "2"}, {"price": "0.58", "size": "3"}]
+
+    class _Clob:
+        def get_order_book(self, token_id: str) -> _Summary:
+            return _Summary()
+
+    async def _run():
+        async with PolymarketClient(Settings.load()) as client:
+            client._clob_client = _Clob()
+            market = Market(platform=Platform.POLYMARKET, market_id="m", title="T", yes_token_id="y")
+            return await client.get_orderbook(market, side="yes")
+
+    book = asyncio.run(_run())
+
+    assert [level.price for level in book.bids] == [0.45, 0.42, 0.40]
+    assert [level.price for level in book.asks] == [0.55, 0.58, 0.60]
@@ -0,0 +1,144 @@
+"""Polymarket WS 本地订单簿状态的基础单元测试。"""
+
+from __future__ import annotations
+
+import asyncio
+
+from poly_arb_cli.connectors.polymarket_ws import PolymarketStreamState
+
+
+def _levels(levels) -> list[tuple[float, float]]:
+    return [(level.price, level.size) for level in levels]
+
+
+def test_apply_price_change_updates_levels_in_place() -> None:
+    """增量应原地改写、插入或删除价位，并保持买卖盘各自的排序。"""
+
+    state = PolymarketStreamState()
+    state.apply_book_snapshot(
+        "t1",
+        [{"price": "0.50", "size": "10"}, {"price": "0.48", "size": "5"}],
+        [{"price": "0.52", "size": "7"}, {"price": "0.55", "size": "3"}],
+    )
+    book = state.orderbooks["t1"]
+    best_ask = book.asks[0]
+
+    state.apply_price_change(
+        {
+            "event_type": "price_change",
+            "asset_id": "t1",
+            "changes": [
+                {"price": "0.52", "side": "SELL", "size": "9"},
+                {"price": "0.53", "side": "SELL", "size": "2"},
+                {"price": "0.49", "side": "BUY", "size": "4"},
+                {"price": "0.48", "side": "BUY", "size": "0"},
+                {"price": "0.60", "side": "SELL", "size": "0"},
+            ],
+        }
+    )
+
+    assert state.orderbooks["t1"] is book
+    assert book.asks[0] is best_ask
+    assert _levels(book.asks) == [(0.52, 9.0), (0.53, 2.0), (0.55, 3.0)]
+    assert _levels(book.bids) == [(0.50, 10.0), (0.49, 4.0)]
+
+
+def test_apply_price_change_accepts_per_asset_entries_and_ignores_unknown() -> None:
+    """price_changes 格式按条目内 asset_id 路由；无快照的资产被忽略。"""
+
+    state = PolymarketStreamState()
+    state.apply_book_snapshot("t1", [], [{"price": "0.9", "size": "1"}])
+
+    state.apply_price_change(
+        {
+            "event_type": "price_change",
+            "price_changes": [
+                {"asset_id": "t1", "price": "0.85", "side": "SELL", "size": "6"},
+                {"asset_id": "t2", "price": "0.10", "side": "BUY", "size": "6"},
+            ],
+        }
+    )
+
+    assert _levels(state.orderbooks["t1"].asks) == [(0.85, 6.0), (0.9, 1.0)]
+    assert "t2" not in state.orderbooks
+
+
+def test_wait_for_update_wakes_on_changes_and_times_out() -> None:
+    """已有新版本时立即返回；无增量时超时返回 False，增量到达后被唤醒。"""
+
+    async def _run() -> tuple[bool, bool, bool]:
+        state = PolymarketStreamState()
+        seen = state.version
+        state.apply_book_snapshot("t1", [], [{"price": "0.5", "size": "1"}])
+        already = await state.wait_for_update(seen)
+
+        seen = state.version
+        idle = await state.wait_for_update(seen, timeout=0.01)
+
+        async def _push() -> None:
+            await asyncio.sleep(0.01)
+            state.append_last_trade({"asset_id": "t1", "market": "c1", "price": "0.5", "size": "2"})
+
+        pusher = asyncio.create_task(_push())
+        woke = await state.wait_for_update(seen, timeout=1.0)
+        await pusher
+        return already, idle, woke
+
+    assert asyncio.run(_run()) == (True, False, True)
+
+
+def test_trade_accessors_read_from_buffer_tail() -> None:
+    """最近成交接口应按时间顺序返回尾部记录，并给出总条数与最后一笔。"""
+
+    state = PolymarketStreamState()
+    for i in range(5):
+        state.append_last_trade({"asset_id": "t1", "market": "c1", "price": "0.5", "size": "1", "timestamp": i * 1000})
+
+    assert [t.timestamp for t in state.get_last_trades("c1", limit=3)] == [2, 3, 4]
+    assert [t.timestamp for t in state.get_last_trades("c1", limit=10)] == [0, 1, 2, 3, 4]
+    count, last = state.get_last_trade("c1")
+    assert count == 5 and last is not None and last.timestamp == 4
+    assert state.get_last_trade("missing") == (0, None)
+    assert "missing" not in state.trades_by_condition
+
+
+def test_trade_buffers_are_bounded_and_windowed_counts_are_read_only() -> None:
+    """成交缓冲按 max_trades_per_market 限长，按时间窗口计数不会修改缓冲。"""
+
+    state = PolymarketStreamState(max_trades_per_market=3)
+    for ts in range(1, 6):
+        state.append_last_trade({"market": "c1", "asset_id": "y1", "price": "0.5", "size": "1", "timestamp": ts * 1000})
+
+    assert state.trades_by_condition["c1"].maxlen == 3
+    assert [t.timestamp for t in state.get_last_trades("c1")] == [3, 4, 5]
+    count, last = state.get_last_trade("c1", min_timestamp=4)
+    assert (count, last.timestamp) == (2, 5)
+    assert state.get_last_trade("c1", min_timestamp=6)[0] == 0
+    assert len(state.trades_by_condition["c1"]) == 3
+    assert state.get_last_trade("missing", min_timestamp=5) == (0, None)
+
+
+def test_unsorted_snapshot_is_ordered_before_deltas() -> None:
+    """乱序快照在写入时排序，后续增量仍定位到正确档位。"""
+
+    state = PolymarketStreamState()
+    state.apply_book_snapshot(
+        "a1",
+        [{"price": "0.40", "size": "1"}, {"price": "0.48", "size": "2"}, {"price": "0.45", "size": "3"}],
+        [{"price": "0.60", "size": "1"}, {"price": "0.52", "size": "2"}, {"price": "0.55", "size": "3"}],
+    )
+    state.apply_price_change(
+        {
+            "asset_id": "a1",
+            "changes": [
+                {"price": "0.45", "size": "9", "side": "BUY"},
+                {"price": "0.50", "size": "4", "side": "BUY"},
+                {"price": "0.52", "size": "0", "side": "SELL"},
+                {"price": "0.57", "size": "5", "side": "SELL"},
+            ],
+        }
+    )
+
+    book = state.orderbooks["a1"]
+    assert _levels(book.bids) == [(0.50, 4.0), (0.48, 2.0), (0.45, 9.0), (0.40, 1.0)]
+    assert _levels(book.asks) == [(0.55, 3.0), (0.57, 5.0), (0.60, 1.0)]
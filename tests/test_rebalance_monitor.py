@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import time
 from datetime import datetime, timezone
 
 from poly_arb_cli.connectors.polymarket_ws import PolymarketStreamState
@@ -49,8 +50,7 @@ def test_rebalance_monitor_emits_signal_on_large_move() -> None:
         bids=[OrderBookLevel(price=0.49, size=100.0)],
         asks=[OrderBookLevel(price=0.51, size=100.0)],
     )
-    now = datetime.now(timezone.utc)
-    ts_now = int(now.timestamp())
+    ts_now = int(time.time())
     _append_trade(state, notional=1000.0, timestamp=ts_now)
 
     monitor = RebalanceMonitor()
@@ -62,7 +62,7 @@ def test_rebalance_monitor_emits_signal_on_large_move() -> None:
         min_abs_move=0.1,
         min_notional=500.0,
         max_age_seconds=300,
-        now=now,
+        now_ts=ts_now,
     )
     assert signals_first == []
 
@@ -71,8 +71,7 @@ def test_rebalance_monitor_emits_signal_on_large_move() -> None:
         bids=[OrderBookLevel(price=0.79, size=100.0)],
         asks=[OrderBookLevel(price=0.81, size=100.0)],
     )
-    later = now.replace(second=now.second + 1)
-    ts_later = int(later.timestamp())
+    ts_later = ts_now + 1
     _append_trade(state, notional=1200.0, timestamp=ts_later)
 
     signals_second = monitor.detect_signals(
@@ -81,10 +80,89 @@ def test_rebalance_monitor_emits_signal_on_large_move() -> None:
         min_abs_move=0.1,
         min_notional=500.0,
         max_age_seconds=300,
-        now=later,
+        now_ts=ts_later,
     )
 
     assert len(signals_second) == 1
     signal = signals_second[0]
     assert signal.direction == "short_yes"
     assert signal.current_yes > signal.baseline_yes
+
+
+def test_rebalance_monitor_default_now_does_not_fail() -> None:
+    """未显式传入 now 时应使用当前时间，而不是抛出异常。"""
+
+    state = PolymarketStreamState()
+    market = _make_market()
+    state.orderbooks["y1"] = OrderBook(
+        bids=[OrderBookLevel(price=0.49, size=100.0)],
+        asks=[OrderBookLevel(price=0.51, size=100.0)],
+    )
+    _append_trade(state, notional=1000.0, timestamp=int(datetime.now(timezone.utc).timestamp()))
+
+    assert RebalanceMonitor().detect_signals(state, [market]) == []
+
+
+def test_rebalance_monitor_tracks_baseline_without_trades() -> None:
+    """没有合格成交时不输出信号，但 EMA 基线仍随盘口更新。"""
+
+    state = PolymarketStreamState()
+    market = _make_market()
+    state.orderbooks["y1"] = OrderBook(
+        bids=[OrderBookLevel(price=0.49, size=100.0)],
+        asks=[OrderBookLevel(price=0.51, size=100.0)],
+    )
+    now = datetime.now(timezone.utc)
+    _append_trade(state, notional=100.0, timestamp=int(now.timestamp()))
+
+    monitor = RebalanceMonitor()
+    assert monitor.detect_signals(state, [market], min_notional=500.0, now=now) == []
+
+    assert monitor.baseline_yes == {"c1": 0.5}
+
+
+def test_rebalance_monitor_fires_on_shock_after_quiet_ticks() -> None:
+    """平静期建立基线后，首笔鲸鱼成交伴随价格跳动即应触发信号。"""
+
+    state = PolymarketStreamState()
+    market = _make_market()
+    state.orderbooks["y1"] = OrderBook(
+        bids=[OrderBookLevel(price=0.49, size=100.0)],
+        asks=[OrderBookLevel(price=0.51, size=100.0)],
+    )
+    monitor = RebalanceMonitor()
+    for ts in range(1_000, 1_005):
+        assert monitor.detect_signals(state, [market], min_abs_move=0.1, now_ts=ts) == []
+
+    state.orderbooks["y1"] = OrderBook(
+        bids=[OrderBookLevel(price=0.79, size=100.0)],
+        asks=[OrderBookLevel(price=0.81, size=100.0)],
+    )
+    _append_trade(state, notional=1000.0, timestamp=1_005)
+    signals = monitor.detect_signals(state, [market], min_abs_move=0.1, now_ts=1_005)
+
+    assert [s.direction for s in signals] == ["short_yes"]
+    assert abs(signals[0].baseline_yes - 0.56) < 1e-9
+
+
+def test_rebalance_monitor_rejects_future_and_stale_trades_by_now_ts() -> None:
+    """now_ts 与成交时间戳直接按整数秒比较，过期或晚于当前的成交均被跳过。"""
+
+    state = PolymarketStreamState()
+    market = _make_market()
+    state.orderbooks["y1"] = OrderBook(
+        bids=[OrderBookLevel(price=0.49, size=100.0)],
+        asks=[OrderBookLevel(price=0.51, size=100.0)],
+    )
+    _append_trade(state, notional=1000.0, timestamp=1_000)
+
+    monitor = RebalanceMonitor()
+
+    def _signals(now_ts: int) -> int:
+        return len(monitor.detect_signals(state, [market], min_abs_move=0.0, max_age_seconds=300, now_ts=now_ts))
+
+    assert _signals(999) == 0
+    assert _signals(1_300) == 1
+    assert _signals(1_301) == 0
+    # 检测器只读：窗口外的成交仍保留在共享缓冲中。
+    assert len(state.trades_by_condition["c1"]) == 1
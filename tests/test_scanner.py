@@ -0,0 +1,235 @@
+"""跨盘套利扫描 scan_once 的基础单元测试。"""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from poly_arb_cli.config import Settings
+from poly_arb_cli.connectors.polymarket_ws import PolymarketStreamState
+from poly_arb_cli.services import scanner
+from poly_arb_cli.services.scanner import evaluate_pairs, prepare_scan, scan_once
+from poly_arb_cli.types import Market, MatchedMarket, OrderBook, OrderBookLevel, Platform, Route
+
+
+class _FakeClient:
+    """按 (market_id, side) 返回固定盘口的测试客户端。"""
+
+    def __init__(self, settings: Settings, markets: list[Market], books: dict[tuple[str, str], OrderBook]):
+        self.settings = settings
+        self.markets = markets
+        self.books = books
+        self.calls: list[tuple[str, str]] = []
+
+    async def list_active_markets(self, limit: int = 50) -> list[Market]:
+        return self.markets[:limit]
+
+    async def get_orderbook(self, market: Market, side: str = "yes") -> OrderBook:
+        self.calls.append((market.market_id, side))
+        return self.books.get((market.market_id, side), OrderBook(bids=[], asks=[]))
+
+
+def _book(price: float, size: float = 100.0) -> OrderBook:
+    """构造只有一档卖单的盘口。"""
+
+    return OrderBook(bids=[], asks=[OrderBookLevel(price=price, size=size)])
+
+
+def test_scan_once_finds_cross_venue_route() -> None:
+    """PM_NO + OP_YES 成本低于 1 时应输出该路线的机会。"""
+
+    settings = Settings.load(overrides={"default_quote_size": 10.0, "min_trade_size": 5.0})
+    pm_market = Market(
+        platform=Platform.POLYMARKET,
+        market_id="pm1",
+        title="Will BTC close above 100k?",
+        yes_token_id="y",
+        no_token_id="n",
+    )
+    op_market = Market(
+        platform=Platform.OPINION,
+        market_id="op1",
+        title="Will BTC close above 100k?",
+        yes_token_id="oy",
+        no_token_id="on",
+    )
+    pm_client = _FakeClient(
+        settings,
+        [pm_market],
+        {("pm1", "yes"): _book(0.60), ("pm1", "no"): _book(0.40)},
+    )
+    op_client = _FakeClient(
+        settings,
+        [op_market],
+        {("op1", "yes"): _book(0.50), ("op1", "no"): _book(0.55)},
+    )
+
+    results = asyncio.run(scan_once(pm_client, op_client, limit=10))  # type: ignore[arg-type]
+
+    assert len(results) == 1
+    opp = results[0]
+    assert opp.route is Route.PM_NO_OP_YES
+    assert opp.route.label == "PM_NO + OP_YES"
+    assert abs(opp.cost - 0.90) < 1e-9
+    assert abs(opp.profit_percent - 10.0) < 1e-9
+    assert sorted(pm_client.calls) == [("pm1", "no"), ("pm1", "yes")]
+    assert sorted(op_client.calls) == [("op1", "no"), ("op1", "yes")]
+
+
+def test_scan_once_returns_early_when_one_venue_is_empty() -> None:
+    """任一平台无市场时不应请求任何盘口。"""
+
+    settings = Settings.load()
+    pm_market = Market(platform=Platform.POLYMARKET, market_id="pm1", title="T", yes_token_id="y")
+    pm_client = _FakeClient(settings, [pm_market], {})
+    op_client = _FakeClient(settings, [], {})
+
+    results = asyncio.run(scan_once(pm_client, op_client))  # type: ignore[arg-type]
+
+    assert results == []
+    assert pm_client.calls == []
+
+
+def test_scan_once_uses_ws_books_without_rest() -> None:
+    """WS state 同时覆盖 YES/NO 时 Polymarket 一侧不应发起 REST 请求。"""
+
+    settings = Settings.load(overrides={"default_quote_size": 10.0, "min_trade_size": 5.0})
+    pm_market = Market(
+        platform=Platform.POLYMARKET, market_id="pm1", title="Will ETH flip?", yes_token_id="y", no_token_id="n"
+    )
+    op_market = Market(
+        platform=Platform.OPINION, market_id="op1", title="Will ETH flip?", yes_token_id="oy", no_token_id="on"
+    )
+    state = PolymarketStreamState()
+    state.apply_book_snapshot("y", [], [{"price": "0.60", "size": "100"}])
+    state.apply_book_snapshot("n", [], [{"price": "0.40", "size": "100"}])
+    pm_client = _FakeClient(settings, [pm_market], {})
+    op_client = _FakeClient(settings, [op_market], {("op1", "yes"): _book(0.50), ("op1", "no"): _book(0.55)})
+
+    results = asyncio.run(scan_once(pm_client, op_client, pm_state=state))  # type: ignore[arg-type]
+
+    assert [opp.route for opp in results] == [Route.PM_NO_OP_YES]
+    assert pm_client.calls == []
+
+
+def test_scan_once_lists_both_venues_concurrently() -> None:
+    """两个平台的市场列表请求应并发发出，而不是逐个等待。"""
+
+    settings = Settings.load()
+    events: list[str] = []
+
+    class _SlowListClient(_FakeClient):
+        async def list_active_markets(self, limit: int = 50) -> list[Market]:
+            events.append("start")
+            await asyncio.sleep(0)
+            events.append("end")
+            return []
+
+    pm_client = _SlowListClient(settings, [], {})
+    op_client = _SlowListClient(settings, [], {})
+
+    assert asyncio.run(scan_once(pm_client, op_client)) == []  # type: ignore[arg-type]
+    assert events == ["start", "start", "end", "end"]
+
+
+def test_evaluate_pair_skips_fills_when_top_of_book_is_unprofitable(monkeypatch) -> None:
+    """最优卖价之和已不低于 1 的路线不应再遍历盘口计算成交均价。"""
+
+    calls: list[str] = []
+    real_compute_fill = scanner.compute_fill
+
+    def _counting_fill(book: OrderBook, side: str, size: float):
+        calls.append(side)
+        return real_compute_fill(book, side=side, size=size)
+
+    monkeypatch.setattr(scanner, "compute_fill", _counting_fill)
+    settings = Settings.load(overrides={"default_quote_size": 10.0, "min_trade_size": 5.0})
+    pm_market = Market(platform=Platform.POLYMARKET, market_id="pm1", title="T")
+    op_market = Market(platform=Platform.OPINION, market_id="op1", title="T")
+
+    results = scanner._evaluate_pair(
+        MatchedMarket(polymarket=pm_market, opinion=op_market),
+        _book(0.60),
+        _book(0.40),
+        _book(0.50),
+        _book(0.55),
+        settings,
+    )
+
+    assert [opp.route for opp in results] == [Route.PM_NO_OP_YES]
+    assert len(calls) == 2
+
+
+def test_evaluate_pair_prune_holds_for_unsorted_rest_books() -> None:
+    """REST 盘口按由劣到优返回时，构造排序后剪枝不应丢掉有利可图的路线。"""
+
+    settings = Settings.load(overrides={"default_quote_size": 10.0, "min_trade_size": 5.0})
+    pair = MatchedMarket(
+        polymarket=Market(platform=Platform.POLYMARKET, market_id="pm1", title="T"),
+        opinion=Market(platform=Platform.OPINION, market_id="op1", title="T"),
+    )
+
+    def _worst_first(*prices: float) -> OrderBook:
+        return OrderBook.from_unsorted([], [OrderBookLevel(price=p, size=100.0) for p in prices])
+
+    results = scanner._evaluate_pair(
+        pair,
+        _book(0.60),
+        _worst_first(0.70, 0.40),
+        _worst_first(0.65, 0.50),
+        _book(0.55),
+        settings,
+    )
+
+    assert [(opp.route, round(opp.cost, 9)) for opp in results] == [(Route.PM_NO_OP_YES, 0.9)]
+
+
+def test_scan_once_fetches_only_the_pm_side_missing_from_ws() -> None:
+    """WS 只覆盖一侧时，REST 只补拉缺失的那一侧，并保留 WS 盘口。"""
+
+    settings = Settings.load(overrides={"default_quote_size": 10.0, "min_trade_size": 5.0})
+    pm_market = Market(
+        platform=Platform.POLYMARKET, market_id="pm1", title="Will SOL flip?", yes_token_id="y", no_token_id="n"
+    )
+    op_market = Market(
+        platform=Platform.OPINION, market_id="op1", title="Will SOL flip?", yes_token_id="oy", no_token_id="on"
+    )
+    state = PolymarketStreamState()
+    state.apply_book_snapshot("n", [], [{"price": "0.40", "size": "100"}])
+    pm_client = _FakeClient(settings, [pm_market], {("pm1", "yes"): _book(0.60), ("pm1", "no"): _book(0.99)})
+    op_client = _FakeClient(settings, [op_market], {("op1", "yes"): _book(0.50), ("op1", "no"): _book(0.55)})
+
+    results = asyncio.run(scan_once(pm_client, op_client, pm_state=state))  # type: ignore[arg-type]
+
+    assert pm_client.calls == [("pm1", "yes")]
+    assert [(opp.route, round(opp.cost, 9)) for opp in results] == [(Route.PM_NO_OP_YES, 0.9)]
+
+
+def test_evaluate_pairs_reprices_from_ws_without_refetching() -> None:
+    """准备一次后，WS 盘口变化只需本地重算即可反映，不再请求任何盘口。"""
+
+    settings = Settings.load(overrides={"default_quote_size": 10.0, "min_trade_size": 5.0})
+    title = "Will BTC close above 100k?"
+    pm_market = Market(
+        platform=Platform.POLYMARKET, market_id="pm1", title=title, yes_token_id="y", no_token_id="n"
+    )
+    op_market = Market(platform=Platform.OPINION, market_id="op1", title=title)
+    pm_client = _FakeClient(
+        settings, [pm_market], {("pm1", "yes"): _book(0.60), ("pm1", "no"): _book(0.40)}
+    )
+    op_client = _FakeClient(
+        settings, [op_market], {("op1", "yes"): _book(0.50), ("op1", "no"): _book(0.55)}
+    )
+    state = PolymarketStreamState()
+
+    snapshot = asyncio.run(prepare_scan(pm_client, op_client, pm_state=state))  # type: ignore[arg-type]
+    first = evaluate_pairs(snapshot, settings, state)
+    assert [opp.cost for opp in first] == pytest.approx([0.90])
+
+    state.apply_book_snapshot("n", [], [{"price": "0.45", "size": "100"}])
+    results = evaluate_pairs(snapshot, settings, state)
+
+    assert [opp.cost for opp in results] == pytest.approx([0.95])
+    assert len(pm_client.calls) == 2
+    assert len(op_client.calls) == 2
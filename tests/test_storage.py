@@ -0,0 +1,48 @@
+"""JSONL 落盘写入器的基础单元测试。"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+
+from poly_arb_cli import storage
+
+
+def test_jsonl_writer_appends_batches_with_single_handle(tmp_path: Path) -> None:
+    """多批写入应复用同一句柄，并按行追加、保留中文。"""
+
+    writer = storage.JsonlWriter(tmp_path / "sub" / "out.jsonl")
+    writer.write([{"a": 1}, {"note": "滑点"}])
+    handle = writer._fh
+    writer.write([])
+    writer.write([{"a": 2}])
+    writer.close()
+
+    lines = (tmp_path / "sub" / "out.jsonl").read_text(encoding="utf-8").splitlines()
+    assert handle is not None and handle.closed
+    assert [json.loads(line) for line in lines] == [{"a": 1}, {"note": "滑点"}, {"a": 2}]
+    assert lines[1] == '{"note": "滑点"}'
+
+
+def test_log_trades_appends_default_json_format(tmp_path: Path, monkeypatch) -> None:
+    """一次性日志接口每次调用后关闭文件，行格式与 json.dumps 默认分隔符一致。"""
+
+    monkeypatch.setattr(storage, "DATA_DIR", tmp_path)
+    storage.log_trades(iter([{"id": "x", "n": 1}]), file_name="t.jsonl")
+    storage.log_trades([{"id": "y"}], file_name="t.jsonl")
+
+    assert (tmp_path / "t.jsonl").read_text(encoding="utf-8") == '{"id": "x", "n": 1}\n{"id": "y"}\n'
+
+
+def test_opportunity_rows_are_written_as_named_records(tmp_path: Path) -> None:
+    """元组行按 OPPORTUNITY_FIELDS 映射为与 dict 记录相同的 JSONL 行。"""
+
+    writer = storage.JsonlWriter(tmp_path / "o.jsonl")
+    row = ("2024-01-01T00:00:00Z", "PM_NO + OP_YES", "pm1", "op1", 10.0, 0.95, 5.2, None)
+    asyncio.run(asyncio.to_thread(writer.write_rows, storage.OPPORTUNITY_FIELDS, [row]))
+    writer.close()
+
+    record = json.loads((tmp_path / "o.jsonl").read_text(encoding="utf-8"))
+    assert list(record) == list(storage.OPPORTUNITY_FIELDS)
+    assert tuple(record.values()) == row
@@ -1,11 +1,20 @@
 from __future__ import annotations
 
+import asyncio
 from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator
 
 import pytest
 
 from poly_arb_cli.config import Settings
-from poly_arb_cli.services.tail_scanner import TailSweepOpportunity, _hours_to_resolve
+from poly_arb_cli.connectors.polymarket_ws import PolymarketStreamState
+from poly_arb_cli.services.tail_scanner import (
+    TailSweepOpportunity,
+    _hours_to_resolve,
+    _hours_to_resolve_batch,
+    _sweep_depth,
+    scan_tail_once,
+)
 from poly_arb_cli.types import Market, OrderBook, OrderBookLevel, Platform
 
 
@@ -63,3 +72,201 @@ def test_orderbook_helpers_do_not_fail() -> None:
     )
     assert book.best_ask() is not None
     assert book.best_bid() is not None
+
+
+class _FakePmClient:
+    """返回固定市场与 YES 盘口的 Polymarket 测试客户端。"""
+
+    def __init__(self, markets: list[Market], books: dict[str, OrderBook]):
+        self.markets = markets
+        self.books = books
+        self.calls: list[str] = []
+
+    async def iter_market_pages(self, limit: int = 500, page_size: int = 2) -> AsyncIterator[list[Market]]:
+        markets = self.markets[:limit]
+        for start in range(0, len(markets), page_size):
+            yield markets[start : start + page_size]
+
+    async def get_orderbook(self, market: Market, side: str = "yes") -> OrderBook:
+        self.calls.append(market.market_id)
+        return self.books.get(market.market_id, OrderBook(bids=[], asks=[]))
+
+
+def test_scan_tail_once_filters_and_scores_markets() -> None:
+    """仅对候选市场拉取盘口，并输出满足阈值的尾盘机会。"""
+
+    end = (datetime.now(timezone.utc) + timedelta(hours=10)).isoformat()
+    far_end = (datetime.now(timezone.utc) + timedelta(days=30)).isoformat()
+    markets = [
+        Market(platform=Platform.POLYMARKET, market_id="hit", title="A", end_date=end, yes_token_id="y1"),
+        Market(platform=Platform.POLYMARKET, market_id="cheap", title="B", end_date=end, yes_token_id="y2"),
+        Market(platform=Platform.POLYMARKET, market_id="far", title="C", end_date=far_end, yes_token_id="y3"),
+        Market(platform=Platform.POLYMARKET, market_id="no_token", title="D", end_date=end),
+    ]
+    books = {
+        "hit": OrderBook(bids=[], asks=[OrderBookLevel(price=0.99, size=1000.0)]),
+        "cheap": OrderBook(bids=[], asks=[OrderBookLevel(price=0.90, size=1000.0)]),
+    }
+    client = _FakePmClient(markets, books)
+    settings = Settings.load(overrides={"tail_min_notional": 10.0})
+
+    results = asyncio.run(scan_tail_once(client, pm_state=None, settings=settings))  # type: ignore[arg-type]
+
+    assert sorted(client.calls) == ["cheap", "hit"]
+    assert [opp.market.market_id for opp in results] == ["hit"]
+    opp = results[0]
+    assert opp.yes_price == 0.99
+    assert opp.max_sweep_size == 50.0
+    assert pytest.approx(opp.hours_to_resolve, rel=1e-3) == 10.0
+
+
+def test_sweep_depth_caps_fill_and_sums_top_levels() -> None:
+    """可扫数量不超过目标，深度只统计前五档。"""
+
+    book = OrderBook(
+        bids=[],
+        asks=[OrderBookLevel(price=0.99 + i * 0.001, size=10.0) for i in range(8)],
+    )
+    assert _sweep_depth(book, 25.0) == (25.0, 50.0)
+    assert _sweep_depth(book, 500.0) == (80.0, 50.0)
+    assert _sweep_depth(OrderBook(bids=[], asks=[]), 25.0) == (0.0, 0.0)
+
+
+def test_hours_to_resolve_prefers_cached_end_dt() -> None:
+    """Market 上已有 end_dt_utc 缓存时直接使用，解析结果也会写回缓存。"""
+
+    now = datetime(2024, 1, 1, 0, 0, tzinfo=timezone.utc)
+    cached = Market(
+        platform=Platform.POLYMARKET,
+        market_id="1",
+        title="Test",
+        end_date="not-a-date",
+        end_dt_utc=now + timedelta(hours=5),
+    )
+    assert pytest.approx(_hours_to_resolve(cached, now=now), rel=1e-3) == 5.0
+
+    lazy = Market(platform=Platform.POLYMARKET, market_id="2", title="Test", end_date="2024-01-01T02:00:00Z")
+    assert pytest.approx(_hours_to_resolve(lazy, now=now), rel=1e-3) == 2.0
+    assert lazy.end_dt_utc == now + timedelta(hours=2)
+
+
+def test_scan_tail_once_keeps_only_top_k() -> None:
+    """配置 tail_top_k 时只返回收益率最高的前 K 个机会。"""
+
+    end = (datetime.now(timezone.utc) + timedelta(hours=10)).isoformat()
+    prices = {"a": 0.97, "b": 0.99, "c": 0.98}
+    markets = [
+        Market(platform=Platform.POLYMARKET, market_id=mid, title=mid, end_date=end, yes_token_id=mid)
+        for mid in prices
+    ]
+    books = {mid: OrderBook(bids=[], asks=[OrderBookLevel(price=p, size=1000.0)]) for mid, p in prices.items()}
+    settings = Settings.load(overrides={"tail_min_notional": 10.0, "tail_top_k": 2})
+
+    results = asyncio.run(
+        scan_tail_once(_FakePmClient(markets, books), pm_state=None, settings=settings)  # type: ignore[arg-type]
+    )
+
+    assert [opp.market.market_id for opp in results] == ["a", "c"]
+
+
+def test_scan_tail_once_prunes_by_yield_upper_bound() -> None:
+    """收益率上界不达标时直接返回；年化门槛反推的时间窗外市场不拉取盘口。"""
+
+    now = datetime.now(timezone.utc)
+    markets = [
+        Market(
+            platform=Platform.POLYMARKET,
+            market_id=mid,
+            title=mid,
+            end_date=(now + timedelta(hours=h)).isoformat(),
+            yes_token_id=mid,
+        )
+        for mid, h in (("near", 10), ("far", 50))
+    ]
+    client = _FakePmClient(markets, {})
+
+    hopeless = Settings.load(overrides={"tail_min_yes_price": 0.999, "tail_min_yield_percent": 0.5})
+    assert asyncio.run(scan_tail_once(client, pm_state=None, settings=hopeless)) == []  # type: ignore[arg-type]
+    assert client.calls == []
+
+    # min_price=0.95、fee=2% 时收益率上界约 5.16%，年化门槛 1000% 对应约 45 小时。
+    strict = Settings.load(overrides={"tail_min_annualized_yield_percent": 1000.0})
+    asyncio.run(scan_tail_once(client, pm_state=None, settings=strict))  # type: ignore[arg-type]
+    assert client.calls == ["near"]
+
+
+def test_scan_tail_once_uses_ws_books_before_rest() -> None:
+    """WS state 中已有卖盘的 token 不再走 REST，空卖盘或缺失的才回退。"""
+
+    end = (datetime.now(timezone.utc) + timedelta(hours=10)).isoformat()
+    markets = [
+        Market(platform=Platform.POLYMARKET, market_id=mid, title=mid, end_date=end, yes_token_id=f"t_{mid}")
+        for mid in ("ws", "empty", "rest")
+    ]
+    state = PolymarketStreamState()
+    state.apply_book_snapshot("t_ws", [], [{"price": "0.99", "size": "1000"}])
+    state.apply_book_snapshot("t_empty", [{"price": "0.5", "size": "1"}], [])
+    client = _FakePmClient(markets, {})
+    settings = Settings.load(overrides={"tail_min_notional": 10.0})
+
+    results = asyncio.run(scan_tail_once(client, pm_state=state, settings=settings))  # type: ignore[arg-type]
+
+    assert sorted(client.calls) == ["empty", "rest"]
+    assert [opp.market.market_id for opp in results] == ["ws"]
+    assert set(state.bulk_ask_snapshot(["t_ws", "t_empty", "missing"])) == {"t_ws"}
+
+
+def test_orderbook_apply_delta_keeps_best_levels_at_head() -> None:
+    """增量更新后最优买卖价仍位于列表头部，best_bid/best_ask 保持 O(1)。"""
+
+    book = OrderBook(
+        bids=[OrderBookLevel(price=0.50, size=10)],
+        asks=[OrderBookLevel(price=0.99, size=20)],
+    )
+    assert book.apply_delta("buy", 0.52, 5.0)
+    assert book.apply_delta("SELL", 0.98, 7.0)
+    assert book.apply_delta("SELL", 0.995, 1.0)
+    assert not book.apply_delta("hold", 0.1, 1.0)
+    assert (book.best_bid().price, book.best_ask().price) == (0.52, 0.98)
+
+    assert book.apply_delta("BUY", 0.52, 0.0)
+    assert book.apply_delta("SELL", 0.99, 3.0)
+    assert book.best_bid().price == 0.50
+    assert [(lvl.price, lvl.size) for lvl in book.asks] == [(0.98, 7.0), (0.99, 3.0), (0.995, 1.0)]
+
+
+def test_hours_to_resolve_batch_matches_scalar_and_memoizes() -> None:
+    """批量结果与逐个计算一致，重复 end_date 只计算一次并写入 memo。"""
+
+    now = datetime(2024, 1, 1, 0, 0, tzinfo=timezone.utc)
+    ends = [
+        (now + timedelta(hours=10)).isoformat(),
+        (now - timedelta(hours=1)).isoformat(),
+        "garbage",
+        (now + timedelta(hours=10)).isoformat(),
+    ]
+    markets = [Market(platform=Platform.POLYMARKET, market_id=str(i), title="T", end_date=e) for i, e in enumerate(ends)]
+    memo: dict[str, float | None] = {}
+
+    hours = _hours_to_resolve_batch(markets, now, memo)
+
+    assert hours == [_hours_to_resolve(m, now=now) for m in markets]
+    assert pytest.approx(hours[0]) == 10.0
+    assert hours[1:3] == [None, None]
+    assert len(memo) == 3
+
+
+def test_scan_tail_once_skips_market_ids_repeated_across_pages() -> None:
+    """同一 market_id 出现在多页时只拉取一次盘口、只输出一次机会。"""
+
+    end = (datetime.now(timezone.utc) + timedelta(hours=10)).isoformat()
+    hit = Market(platform=Platform.POLYMARKET, market_id="hit", title="A", end_date=end, yes_token_id="y1")
+    other = Market(platform=Platform.POLYMARKET, market_id="other", title="B", end_date=end, yes_token_id="y2")
+    books = {"hit": OrderBook(bids=[], asks=[OrderBookLevel(price=0.99, size=1000.0)])}
+    client = _FakePmClient([hit, other, hit], books)
+    settings = Settings.load(overrides={"tail_min_notional": 10.0})
+
+    results = asyncio.run(scan_tail_once(client, pm_state=None, settings=settings))  # type: ignore[arg-type]
+
+    assert sorted(client.calls) == ["hit", "other"]
+    assert [opp.market.market_id for opp in results] == ["hit"]
@@ -0,0 +1,149 @@
+"""双边下单 Trader 的基础单元测试。"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Optional
+
+import httpx
+
+from poly_arb_cli.config import Settings
+from poly_arb_cli.services.trader import Trader, _is_retryable, _route_to_sides
+from poly_arb_cli.types import ArbOpportunity, Market, MatchedMarket, Platform, Route
+
+
+class _FakeVenue:
+    """按预设结果下单并记录调用的测试客户端。"""
+
+    def __init__(self, outcomes: list[object]):
+        self.outcomes = outcomes
+        self.placed = 0
+        self.cancelled: list[str] = []
+
+    async def place_order(self, market: Market, side: str, price: float, size: float) -> str:
+        outcome = self.outcomes[min(self.placed, len(self.outcomes) - 1)]
+        self.placed += 1
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return str(outcome)
+
+    async def cancel_order(self, order_id: str) -> bool:
+        self.cancelled.append(order_id)
+        return True
+
+    async def close(self) -> None:
+        return None
+
+
+def _opportunity(route: Route = Route.PM_NO_OP_YES) -> ArbOpportunity:
+    pair = MatchedMarket(
+        polymarket=Market(platform=Platform.POLYMARKET, market_id="pm1", title="T"),
+        opinion=Market(platform=Platform.OPINION, market_id="op1", title="T"),
+        similarity=1.0,
+    )
+    return ArbOpportunity(pair=pair, route=route, cost=0.9, profit_percent=10.0, size=10.0)
+
+
+def _execute(pm: _FakeVenue, op: _FakeVenue, opportunity: Optional[ArbOpportunity] = None):
+    trader = Trader(pm, op, Settings.load())  # type: ignore[arg-type]
+    return asyncio.run(trader.execute(opportunity or _opportunity(), size=10.0))
+
+
+def test_is_retryable_only_accepts_transient_errors() -> None:
+    """传输错误与 5xx 可重试，校验错误与 4xx 不重试。"""
+
+    request = httpx.Request("POST", "https://example.invalid/order")
+    assert _is_retryable(httpx.ConnectError("boom", request=request))
+    assert _is_retryable(asyncio.TimeoutError())
+    assert _is_retryable(
+        httpx.HTTPStatusError("5xx", request=request, response=httpx.Response(503, request=request))
+    )
+    assert not _is_retryable(
+        httpx.HTTPStatusError("4xx", request=request, response=httpx.Response(400, request=request))
+    )
+    assert not _is_retryable(ValueError("bad size"))
+
+
+def test_execute_does_not_retry_deterministic_failures() -> None:
+    """确定性错误只尝试一次，并对已成交一侧执行撤单回滚。"""
+
+    pm = _FakeVenue([ValueError("bad size")])
+    op = _FakeVenue(["op-order"])
+
+    result = _execute(pm, op)
+
+    assert not result.success
+    assert pm.placed == 1
+    assert op.cancelled == ["op-order"]
+    assert result.pm_leg.status == "failed"
+    assert result.pm_leg.error == "bad size"
+    assert result.op_leg.status == "submitted"
+    assert result.op_leg.error is None
+
+
+def test_rollback_cancels_both_legs_concurrently() -> None:
+    """两侧撤单应并发发起，单侧撤单失败只标记该侧。"""
+
+    started: list[str] = []
+    in_flight = 0
+    max_in_flight = 0
+
+    class _SlowCancelVenue(_FakeVenue):
+        def __init__(self, name: str, fail: bool):
+            super().__init__([f"{name}-order"])
+            self.name = name
+            self.fail = fail
+
+        async def cancel_order(self, order_id: str) -> bool:
+            # 在途计数只在这里记录，断言放到 _rollback 返回之后，避免被回滚的异常处理吞掉。
+            nonlocal in_flight, max_in_flight
+            started.append(self.name)
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            try:
+                await asyncio.sleep(0.01)
+            finally:
+                in_flight -= 1
+            if self.fail:
+                raise RuntimeError("cancel rejected")
+            return True
+
+    pm = _SlowCancelVenue("pm", fail=True)
+    op = _SlowCancelVenue("op", fail=False)
+    trader = Trader(pm, op, Settings.load())  # type: ignore[arg-type]
+    opp = _opportunity()
+    result = asyncio.run(trader.execute(opp, size=10.0))
+    assert result.success
+
+    asyncio.run(trader._rollback(result.pm_leg, result.op_leg))
+
+    assert started == ["pm", "op"]
+    assert max_in_flight == 2
+    assert result.pm_leg.error == "cancel_failed"
+    assert result.op_leg.error is None
+
+
+def test_route_to_sides_indexes_lookup_table() -> None:
+    """路线枚举直接映射到两侧下单方向。"""
+
+    assert _route_to_sides(Route.PM_NO_OP_YES) == ("no", "yes")
+    assert _route_to_sides(Route.PM_YES_OP_NO) == ("yes", "no")
+    assert Route.PM_YES_OP_NO.label == "PM_YES + OP_NO"
+
+
+def test_execute_rolls_back_slow_leg_that_succeeds_after_sibling_fails() -> None:
+    """一侧先失败时，另一侧仍应完成下单并被回滚撤单，而不是被中途取消。"""
+
+    class _SlowVenue(_FakeVenue):
+        async def place_order(self, market: Market, side: str, price: float, size: float) -> str:
+            await asyncio.sleep(0.01)
+            return await super().place_order(market, side, price, size)
+
+    pm = _FakeVenue([ValueError("rejected")])
+    op = _SlowVenue(["op-order"])
+
+    result = _execute(pm, op)
+
+    assert not result.success
+    assert result.op_leg.order_id == "op-order"
+    assert op.cancelled == ["op-order"]